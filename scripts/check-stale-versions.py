@@ -3,10 +3,22 @@
 Check Stale Versions - Check for servers with outdated versions
 """
 import argparse
+import functools
 import json
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional - fall back to the standard library json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional - fall back to loading the whole file
+    ijson = None
 
 # Configure logging
 logging.basicConfig(
@@ -19,8 +31,22 @@ logger = logging.getLogger(__name__)
 def load_json_file(file_path: str) -> Dict:
     """Load JSON file"""
     try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        raw = Path(file_path).read_bytes()
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except Exception as e:
+        logger.error(f"Error loading {file_path}: {e}")
+        raise
+
+
+def iter_servers(file_path: str) -> Iterator[Dict]:
+    """Yield server entries from servers.json one at a time"""
+    if ijson is None:
+        yield from load_json_file(file_path).get('servers', [])
+        return
+
+    try:
+        with open(file_path, 'rb') as f:
+            yield from ijson.items(f, 'servers.item', use_float=True)
     except Exception as e:
         logger.error(f"Error loading {file_path}: {e}")
         raise
@@ -37,50 +63,63 @@ def save_json_file(data: List[Dict], file_path: str):
         raise
 
 
+def _parse_iso(date_str: str) -> datetime:
+    """Parse an ISO-8601 date or datetime string as UTC"""
+    length = len(date_str)
+    if length == 10:
+        # YYYY-MM-DD
+        return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                        tzinfo=timezone.utc)
+    if date_str[10:11] == 'T' and (length == 19 or (length == 20 and date_str[19] == 'Z')):
+        # YYYY-MM-DDTHH:MM:SS with optional trailing Z
+        return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                        int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+                        tzinfo=timezone.utc)
+    if length > 21 and date_str[10] == 'T' and date_str[19] == '.' and date_str[-1] == 'Z':
+        # YYYY-MM-DDTHH:MM:SS.fffZ (scan dates)
+        return datetime(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                        int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+                        int(date_str[20:-1][:6].ljust(6, '0')), tzinfo=timezone.utc)
+
+    # Anything else (offsets, unusual precision) goes to the C-level ISO parser
+    parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> datetime:
-    """Parse date string to datetime object"""
+    """Parse date string to datetime object (memoized per string)"""
     try:
-        # Try different date formats
-        formats = [
-            "%Y-%m-%dT%H:%M:%S.%fZ",
-            "%Y-%m-%dT%H:%M:%SZ",
-            "%Y-%m-%dT%H:%M:%S",
-            "%Y-%m-%d"
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).replace(tzinfo=timezone.utc)
-            except ValueError:
-                continue
-        
-        # Fallback - try to parse ISO format
-        return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        
+        return _parse_iso(date_str)
     except Exception as e:
         logger.warning(f"Could not parse date '{date_str}': {e}")
         return datetime.now(timezone.utc)
 
 
-def calculate_days_since_update(release_date: str, scan_date: str = None) -> int:
-    """Calculate days since version was released or scanned"""
-    now = datetime.now(timezone.utc)
+def calculate_days_since_update(release_date: str, scan_date: Optional[str], now: datetime, today: str) -> int:
+    """Calculate days since version was released or scanned
     
+    ``now`` and ``today`` (YYYY-MM-DD) are computed once per run by the caller.
+    """
     # Use scan date if available, otherwise use release date
     reference_date = scan_date if scan_date else release_date
     
-    if not reference_date:
+    # Nothing to parse for dates that are missing or from today
+    if not reference_date or reference_date.startswith(today):
         return 0
     
     ref_datetime = parse_date(reference_date)
     return (now - ref_datetime).days
 
 
-def check_stale_versions(servers_data: Dict, max_age_days: int) -> List[Dict]:
+def check_stale_versions(servers: Iterable[Dict], max_age_days: int, now: datetime) -> List[Dict]:
     """Check for stale versions in servers data"""
+    today = now.strftime('%Y-%m-%d')
     stale_versions = []
     
-    for server in servers_data.get('servers', []):
+    for server in servers:
         # Get the latest version (first in list)
         if not server.get('versions'):
             continue
@@ -94,7 +133,9 @@ def check_stale_versions(servers_data: Dict, max_age_days: int) -> List[Dict]:
         
         days_since_update = calculate_days_since_update(
             latest_version['release_date'],
-            scan_date
+            scan_date,
+            now,
+            today
         )
         
         # Check if version is stale
@@ -131,11 +172,14 @@ def main():
     
     args = parser.parse_args()
     
-    # Load servers data
-    servers_data = load_json_file(args.servers)
+    # Take a single reference time for every server checked by this run
+    now = datetime.now(timezone.utc)
+    
+    # Stream servers data
+    servers = iter_servers(args.servers)
     
     # Check for stale versions
-    stale_versions = check_stale_versions(servers_data, args.max_age_days)
+    stale_versions = check_stale_versions(servers, args.max_age_days, now)
     
     # Save results
     if stale_versions:
@@ -0,0 +1,46 @@
+#!/usr/bin/env node
+/**
+ * ESLint Worker - Long-lived ESLint process for security-scanner.py
+ *
+ * Reads one JSON request per line on stdin ({"path": "/repo"}) and writes one
+ * JSON response per line on stdout: ESLint's results for that path, or
+ * {"error": "..."}. Node.js and ESLint start once per scan run instead of once
+ * per repository. The worker exits when stdin is closed.
+ */
+const path = require('path');
+const readline = require('readline');
+
+// Prefer the ESLint install the scanner found on PATH (passed as NODE_PATH), so
+// the worker runs the same ESLint as the scanner's eslint command and its
+// availability probe; then a local install, then the global one next to this
+// Node binary. NODE_PATH is listed explicitly because require.resolve would
+// otherwise search the node_modules above this script (this repository's own
+// devDependency) before it.
+const scannerModules = (process.env.NODE_PATH || '').split(path.delimiter).filter(Boolean);
+const globalModules = path.join(path.dirname(process.execPath), '..', 'lib', 'node_modules');
+const { ESLint } = require(require.resolve('eslint', {
+  paths: [...scannerModules, __dirname, process.cwd(), globalModules]
+}));
+
+// Critical-only rules, shared with the scanner's eslint command line
+const eslint = new ESLint({
+  useEslintrc: false,
+  extensions: ['.js', '.jsx', '.ts', '.tsx'],
+  overrideConfigFile: path.join(__dirname, 'eslint-critical.json')
+});
+
+let queue = Promise.resolve();
+
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  // Requests are answered one at a time, in order
+  queue = queue.then(async () => {
+    let response;
+    try {
+      const results = await eslint.lintFiles([JSON.parse(line).path]);
+      response = results.map(({ filePath, messages, errorCount }) => ({ filePath, messages, errorCount }));
+    } catch (error) {
+      response = { error: error.message };
+    }
+    process.stdout.write(JSON.stringify(response) + '\n');
+  });
+});
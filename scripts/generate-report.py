@@ -7,20 +7,48 @@ This script generates human-readable security reports from scan results.
 """
 
 import argparse
+import bisect
+import io
 import json
+import statistics
 import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List, Any
 
+try:
+    import orjson
+except ImportError:  # optional - fall back to the standard library json module
+    orjson = None
+
+# Lower score bounds for each status above 'not-recommended'
+_STATUS_SCORE_CUTOFFS = (50, 70, 85)
+_STATUS_BY_BUCKET = ('not-recommended', 'under-review', 'conditional', 'verified-secure')
+
+_STATUS_EMOJI = {
+    'verified-secure': '🛡️',
+    'conditional': '⚠️',
+    'under-review': '🔄',
+    'not-recommended': '❌',
+    'deprecated': '🗑️'
+}
+
+_SCAN_STATUS_EMOJI = {
+    'pass': '✅',
+    'warning': '⚠️',
+    'fail': '❌',
+    'not-applicable': '➖'
+}
+
 class SecurityReportGenerator:
     """Generate security reports from scan results."""
     
     def __init__(self):
-        self.report_lines = []
+        self._buf = io.StringIO()
     
     def generate_report(self, scan_results: Dict[str, Any]) -> str:
         """Generate a comprehensive security report."""
-        self.report_lines = []
+        self._buf = io.StringIO()
         
         # Header
         self._add_header(scan_results)
@@ -38,18 +66,18 @@ class SecurityReportGenerator:
         # Footer
         self._add_footer()
         
-        return '\n'.join(self.report_lines)
+        return self._buf.getvalue()
     
     def _add_header(self, scan_results: Dict[str, Any]):
         """Add report header."""
-        self.report_lines.extend([
-            "# MCP Server Security Validation Report",
-            "",
-            f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}",
-            f"**Scanner Version:** {scan_results.get('scanner_version', 'unknown')}",
-            f"**Servers Scanned:** {scan_results.get('total_servers_scanned', 0)}",
-            ""
-        ])
+        self._buf.write(
+            "# MCP Server Security Validation Report\n"
+            "\n"
+            f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
+            f"**Scanner Version:** {scan_results.get('scanner_version', 'unknown')}\n"
+            f"**Servers Scanned:** {scan_results.get('total_servers_scanned', 0)}\n"
+            "\n"
+        )
     
     def _add_summary(self, scan_results: Dict[str, Any]):
         """Add summary section."""
@@ -70,56 +98,59 @@ class SecurityReportGenerator:
         status_counts = {'verified-secure': 0, 'conditional': 0, 'under-review': 0, 'not-recommended': 0}
         
         for result in results:
-            if 'error' not in result:
-                for version in result.get('versions', []):
-                    if 'overall_score' in version:
-                        scores.append(version['overall_score'])
-                    
-                    # Count latest version statuses (assume first version is latest)
-                    if version == result.get('versions', [{}])[0]:
-                        version_status = self._determine_status_from_score(version.get('overall_score', 0))
-                        if version_status in status_counts:
-                            status_counts[version_status] += 1
+            if 'error' in result:
+                continue
+            
+            versions = result.get('versions') or []
+            
+            # Count latest version statuses (assume first version is latest)
+            if versions:
+                latest_status = self._determine_status_from_score(versions[0].get('overall_score', 0))
+                status_counts[latest_status] += 1
+            
+            for version in versions:
+                if 'overall_score' in version:
+                    scores.append(version['overall_score'])
         
-        avg_score = sum(scores) / len(scores) if scores else 0
+        avg_score = statistics.fmean(scores) if scores else 0
         
-        self.report_lines.extend([
-            "## Summary",
-            "",
-            f"- **Total Servers:** {total_servers}",
-            f"- **Successful Scans:** {successful_scans}",
-            f"- **Failed Scans:** {error_count}",
-            f"- **Average Security Score:** {avg_score:.1f}/100",
-            "",
-            "### Security Status Distribution",
-            "",
-            f"- 🛡️ **Verified Secure:** {status_counts['verified-secure']} servers",
-            f"- ⚠️ **Conditional:** {status_counts['conditional']} servers", 
-            f"- 🔄 **Under Review:** {status_counts['under-review']} servers",
-            f"- ❌ **Not Recommended:** {status_counts['not-recommended']} servers",
-            ""
-        ])
+        self._buf.write(
+            "## Summary\n"
+            "\n"
+            f"- **Total Servers:** {total_servers}\n"
+            f"- **Successful Scans:** {successful_scans}\n"
+            f"- **Failed Scans:** {error_count}\n"
+            f"- **Average Security Score:** {avg_score:.1f}/100\n"
+            "\n"
+            "### Security Status Distribution\n"
+            "\n"
+            f"- 🛡️ **Verified Secure:** {status_counts['verified-secure']} servers\n"
+            f"- ⚠️ **Conditional:** {status_counts['conditional']} servers\n"
+            f"- 🔄 **Under Review:** {status_counts['under-review']} servers\n"
+            f"- ❌ **Not Recommended:** {status_counts['not-recommended']} servers\n"
+            "\n"
+        )
     
     def _add_server_result(self, result: Dict[str, Any]):
         """Add detailed results for a single server."""
         server_name = result.get('server_name', 'Unknown')
         repository = result.get('repository', '')
         
-        self.report_lines.extend([
-            f"## {server_name}",
-            "",
-            f"**Repository:** {repository}",
-            f"**Scan Date:** {result.get('scan_timestamp', 'Unknown')}",
-            ""
-        ])
+        self._buf.write(
+            f"## {server_name}\n"
+            "\n"
+            f"**Repository:** {repository}\n"
+            f"**Scan Date:** {result.get('scan_timestamp', 'Unknown')}\n"
+            "\n"
+        )
         
         # Add version results
         versions = result.get('versions', [])
         if not versions:
-            self.report_lines.extend([
-                "⚠️ No version information available",
-                ""
-            ])
+            self._buf.write(
+                "⚠️ No version information available\n"
+                "\n"
+            )
             return
         
         for version_result in versions:
@@ -132,12 +163,12 @@ class SecurityReportGenerator:
         status = self._determine_status_from_score(overall_score)
         status_emoji = self._get_status_emoji(status)
         
-        self.report_lines.extend([
-            f"### Version {version} {status_emoji}",
-            "",
-            f"**Overall Security Score:** {overall_score}/100",
-            ""
-        ])
+        self._buf.write(
+            f"### Version {version} {status_emoji}\n"
+            "\n"
+            f"**Overall Security Score:** {overall_score}/100\n"
+            "\n"
+        )
         
         # Add detailed scan results
         scan_types = [
@@ -155,16 +186,15 @@ class SecurityReportGenerator:
         # Add recommendations
         recommendations = version_result.get('recommendations', [])
         if recommendations:
-            self.report_lines.extend([
-                "#### Recommendations",
-                ""
-            ])
+            self._buf.write(
+                "#### Recommendations\n"
+                "\n"
+            )
             for rec in recommendations:
-                self.report_lines.append(f"- {rec}")
-            self.report_lines.append("")
+                self._buf.write(f"- {rec}\n")
+            self._buf.write("\n")
         
-        self.report_lines.append("---")
-        self.report_lines.append("")
+        self._buf.write("---\n\n")
     
     def _add_scan_result(self, scan_name: str, scan_result: Dict[str, Any]):
         """Add results for a specific scan type."""
@@ -173,22 +203,16 @@ class SecurityReportGenerator:
         details = scan_result.get('details', 'No details available')
         issues = scan_result.get('issues_found', 0)
         
-        status_emoji = {
-            'pass': '✅',
-            'warning': '⚠️',
-            'fail': '❌',
-            'not-applicable': '➖'
-        }.get(status, '❓')
+        status_emoji = _SCAN_STATUS_EMOJI.get(status, '❓')
         
-        self.report_lines.extend([
-            f"#### {scan_name} {status_emoji}",
-            "",
-            f"**Score:** {score}/100",
-            f"**Status:** {status.replace('-', ' ').title()}",
-            f"**Issues Found:** {issues}",
-            f"**Details:** {details}",
-            ""
-        ])
+        self._buf.write(f"""#### {scan_name} {status_emoji}
+
+**Score:** {score}/100
+**Status:** {status.replace('-', ' ').title()}
+**Issues Found:** {issues}
+**Details:** {details}
+
+""")
         
         # Add specific details based on scan type
         if scan_result.get('vulnerabilities'):
@@ -206,109 +230,96 @@ class SecurityReportGenerator:
             # NPM audit format
             total = sum(vulnerabilities.values()) if vulnerabilities else 0
             if total > 0:
-                self.report_lines.extend([
-                    "**Vulnerabilities by Severity:**",
-                    ""
-                ])
+                self._buf.write(
+                    "**Vulnerabilities by Severity:**\n"
+                    "\n"
+                )
                 for severity, count in vulnerabilities.items():
                     if count > 0:
-                        self.report_lines.append(f"- {severity.title()}: {count}")
-                self.report_lines.append("")
+                        self._buf.write(f"- {severity.title()}: {count}\n")
+                self._buf.write("\n")
         elif isinstance(vulnerabilities, list):
             # Safety/other format
             if vulnerabilities:
-                self.report_lines.extend([
-                    "**Vulnerability Details:**",
-                    ""
-                ])
+                self._buf.write(
+                    "**Vulnerability Details:**\n"
+                    "\n"
+                )
                 for vuln in vulnerabilities[:5]:  # Limit to first 5
                     vuln_id = vuln.get('id', 'Unknown')
                     vuln_desc = vuln.get('description', 'No description')
-                    self.report_lines.append(f"- **{vuln_id}:** {vuln_desc}")
+                    self._buf.write(f"- **{vuln_id}:** {vuln_desc}\n")
                 
                 if len(vulnerabilities) > 5:
-                    self.report_lines.append(f"- ... and {len(vulnerabilities) - 5} more")
-                self.report_lines.append("")
+                    self._buf.write(f"- ... and {len(vulnerabilities) - 5} more\n")
+                self._buf.write("\n")
     
     def _add_suspicious_patterns(self, patterns):
         """Add suspicious pattern details."""
         if patterns:
-            self.report_lines.extend([
-                "**Suspicious Patterns Found:**",
-                ""
-            ])
+            self._buf.write(
+                "**Suspicious Patterns Found:**\n"
+                "\n"
+            )
             for pattern in patterns[:3]:  # Limit to first 3
                 file_name = pattern.get('file', 'Unknown file')
                 matches = pattern.get('matches', 0)
-                self.report_lines.append(f"- {file_name}: {matches} match(es)")
+                self._buf.write(f"- {file_name}: {matches} match(es)\n")
             
             if len(patterns) > 3:
-                self.report_lines.append(f"- ... and {len(patterns) - 3} more files")
-            self.report_lines.append("")
+                self._buf.write(f"- ... and {len(patterns) - 3} more files\n")
+            self._buf.write("\n")
     
     def _add_security_issues(self, issues):
         """Add security issue details."""
         if issues:
-            self.report_lines.extend([
-                "**Security Issues:**",
-                ""
-            ])
+            self._buf.write(
+                "**Security Issues:**\n"
+                "\n"
+            )
             for issue in issues:
-                self.report_lines.append(f"- {issue}")
-            self.report_lines.append("")
+                self._buf.write(f"- {issue}\n")
+            self._buf.write("\n")
     
     def _add_error_result(self, result: Dict[str, Any]):
         """Add error result for failed scans."""
         server_name = result.get('server_name', 'Unknown')
         error = result.get('error', 'Unknown error')
         
-        self.report_lines.extend([
-            f"## {server_name} ❌",
-            "",
-            f"**Scan Failed:** {error}",
-            f"**Timestamp:** {result.get('scan_timestamp', 'Unknown')}",
-            "",
-            "---",
-            ""
-        ])
+        self._buf.write(
+            f"## {server_name} ❌\n"
+            "\n"
+            f"**Scan Failed:** {error}\n"
+            f"**Timestamp:** {result.get('scan_timestamp', 'Unknown')}\n"
+            "\n"
+            "---\n"
+            "\n"
+        )
     
     def _add_footer(self):
         """Add report footer."""
-        self.report_lines.extend([
-            "",
-            "---",
-            "",
-            "*This report was automatically generated by the MCP Server Security Scanner.*",
-            "",
-            "**Legend:**",
-            "- 🛡️ Verified Secure (Score: 85-100)",
-            "- ⚠️ Conditional (Score: 70-84)", 
-            "- 🔄 Under Review (Score: 50-69)",
-            "- ❌ Not Recommended (Score: 0-49)",
-            "",
-            "**Note:** Security validations are performed to the best of our ability with available tools and methods. Users should perform their own security assessments for production use."
-        ])
+        self._buf.write(
+            "\n"
+            "---\n"
+            "\n"
+            "*This report was automatically generated by the MCP Server Security Scanner.*\n"
+            "\n"
+            "**Legend:**\n"
+            "- 🛡️ Verified Secure (Score: 85-100)\n"
+            "- ⚠️ Conditional (Score: 70-84)\n"
+            "- 🔄 Under Review (Score: 50-69)\n"
+            "- ❌ Not Recommended (Score: 0-49)\n"
+            "\n"
+            "**Note:** Security validations are performed to the best of our ability with available tools and methods. Users should perform their own security assessments for production use.\n"
+        )
     
     def _determine_status_from_score(self, score: int) -> str:
         """Determine security status from score."""
-        if score >= 85:
-            return 'verified-secure'
-        elif score >= 70:
-            return 'conditional'
-        elif score >= 50:
-            return 'under-review'
-        else:
-            return 'not-recommended'
+        return _STATUS_BY_BUCKET[bisect.bisect_right(_STATUS_SCORE_CUTOFFS, score)]
     
     def _get_status_emoji(self, status: str) -> str:
         """Get emoji for security status."""
-        return {
-            'verified-secure': '🛡️',
-            'conditional': '⚠️',
-            'under-review': '🔄',
-            'not-recommended': '❌',
-            'deprecated': '🗑️'
-        }.get(status, '❓')
+        return _STATUS_EMOJI.get(status, '❓')
 
 
 def main():
@@ -333,8 +344,8 @@ def main():
     
     # Load scan results
     try:
-        with open(args.scan_results, 'r') as f:
-            scan_results = json.load(f)
+        raw = Path(args.scan_results).read_bytes()
+        scan_results = orjson.loads(raw) if orjson is not None else json.loads(raw)
     except Exception as e:
         print(f"Error loading scan results: {e}", file=sys.stderr)
         sys.exit(1)
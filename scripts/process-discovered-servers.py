@@ -11,25 +11,83 @@ Usage:
 """
 
 import argparse
+import copy
 import json
 import logging
 from datetime import datetime, timezone
+from itertools import chain
+from pathlib import Path
 from typing import Dict, List, Optional
 import re
 
+try:
+    import orjson
+except ImportError:  # optional - fall back to the standard library json module
+    orjson = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Trailing ".git" suffix and/or slashes stripped by normalize_repo_url
+_REPO_URL_SUFFIX = re.compile(r'(?:\.git)?/*\Z')
+
+# Runs of characters that collapse to a single dash in a slug
+_SLUG_SEPARATORS = re.compile(r'[^a-z0-9]+')
+
+# Names/descriptions that mark obvious test/demo repositories
+_EXCLUDE_PATTERN = re.compile(
+    r'test|demo|example|template|boilerplate|tutorial|learning|practice|experiment'
+)
+
+# Organisations whose servers are categorised as enterprise
+_OFFICIAL_ORG_PATTERN = re.compile(r'anthropic|github|microsoft|google|aws|stripe|notion')
+
+# Placeholder scan results for servers that have not been scanned yet
+_PENDING_SCAN_RESULTS = {
+    "scanner_version": "1.2.0",
+    "static_analysis": {
+        "status": "not-applicable",
+        "details": "Security scan not yet performed",
+        "score": 50,
+        "issues_found": 0
+    },
+    "dependency_scan": {
+        "status": "not-applicable",
+        "details": "Dependency scan not yet performed",
+        "score": 50,
+        "issues_found": 0
+    },
+    "tool_poisoning_check": {
+        "status": "not-applicable",
+        "details": "MCP security scan not yet performed",
+        "score": 50,
+        "issues_found": 0
+    }
+}
+
+def load_json_file(file_path: str) -> Dict:
+    """Load a JSON file, using orjson when it is available."""
+    raw = Path(file_path).read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def save_json_file(data: Dict, file_path: str):
+    """Save a JSON file."""
+    with open(file_path, 'w') as f:
+        json.dump(data, f, indent=2)
+
 def process_discovered_servers(discovered_file: str, existing_file: str, output_file: str):
     """Process discovered servers and generate candidates for addition."""
     
+    # Take a single timestamp for every entry produced by this run
+    now = datetime.now(timezone.utc)
+    today = now.strftime('%Y-%m-%d')
+    timestamp = now.strftime('%Y-%m-%dT%H:%M:%SZ')
+    
     # Load discovered servers
-    with open(discovered_file, 'r') as f:
-        discovered_data = json.load(f)
+    discovered_data = load_json_file(discovered_file)
     
     # Load existing servers
-    with open(existing_file, 'r') as f:
-        existing_data = json.load(f)
+    existing_data = load_json_file(existing_file)
     
     discovered_servers = discovered_data.get('servers', [])
     existing_servers = existing_data.get('servers', [])
@@ -38,16 +96,17 @@ def process_discovered_servers(discovered_file: str, existing_file: str, output_
     logger.info(f"Comparing against {len(existing_servers)} existing servers")
     
     # Get existing repository URLs for deduplication
-    existing_repos = set()
-    for server in existing_servers:
-        if server.get('repository'):
-            existing_repos.add(normalize_repo_url(server['repository']))
+    existing_repos = {
+        normalize_repo_url(server['repository'])
+        for server in existing_servers
+        if server.get('repository')
+    }
     
     # Filter and rank new servers
     new_servers = []
     for server in discovered_servers:
         if should_include_server(server, existing_repos):
-            candidate = convert_to_server_format(server)
+            candidate = convert_to_server_format(server, today, timestamp)
             if candidate:
                 new_servers.append(candidate)
     
@@ -55,12 +114,12 @@ def process_discovered_servers(discovered_file: str, existing_file: str, output_
     
     # Update the servers data
     updated_servers_data = existing_data.copy()
-    updated_servers_data['servers'].extend(new_servers)
-    updated_servers_data['last_updated'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    updated_servers_data['servers'] = existing_servers + new_servers
+    updated_servers_data['last_updated'] = timestamp
     
     # Prepare output
     output_data = {
-        'processing_timestamp': datetime.now(timezone.utc).isoformat(),
+        'processing_timestamp': now.isoformat(),
         'total_discovered': len(discovered_servers),
         'total_existing': len(existing_servers),
         'new_candidates': len(new_servers),
@@ -69,8 +128,7 @@ def process_discovered_servers(discovered_file: str, existing_file: str, output_
     }
     
     # Save results
-    with open(output_file, 'w') as f:
-        json.dump(output_data, f, indent=2)
+    save_json_file(output_data, output_file)
     
     logger.info(f"Processing complete. Results saved to {output_file}")
 
@@ -79,11 +137,12 @@ def normalize_repo_url(url: str) -> str:
     if not url:
         return ""
     
-    # Remove trailing slashes and .git extensions
-    normalized = url.rstrip('/').rstrip('.git')
-    
-    # Convert to lowercase for comparison
-    return normalized.lower()
+    # Remove trailing slashes and .git extension, lowercase for comparison
+    return _REPO_URL_SUFFIX.sub('', url).lower()
+
+def generate_slug(name: str) -> str:
+    """Generate a slug from a server name."""
+    return _SLUG_SEPARATORS.sub('-', name.lower()).strip('-')
 
 def should_include_server(server: Dict, existing_repos: set) -> bool:
     """Determine if a discovered server should be included."""
@@ -101,44 +160,42 @@ def should_include_server(server: Dict, existing_repos: set) -> bool:
     stars = server.get('stars', 0)
     
     if discovery_score < min_discovery_score:
-        logger.debug(f"Excluding {server.get('name')} - low discovery score: {discovery_score}")
+        logger.debug("Excluding %s - low discovery score: %s", server.get('name'), discovery_score)
         return False
     
     if stars is not None and stars < min_stars and server.get('source') == 'github':
-        logger.debug(f"Excluding {server.get('name')} - insufficient stars: {stars}")
+        logger.debug("Excluding %s - insufficient stars: %s", server.get('name'), stars)
         return False
     
     # Check for required fields
     if not server.get('name') or not server.get('repository'):
-        logger.debug(f"Excluding server - missing required fields")
+        logger.debug("Excluding server - missing required fields")
         return False
     
     # Exclude obvious test/demo repositories
     name = server.get('name', '').lower()
     description = server.get('description', '').lower()
     
-    exclude_patterns = [
-        'test', 'demo', 'example', 'template', 'boilerplate',
-        'tutorial', 'learning', 'practice', 'experiment'
-    ]
-    
-    for pattern in exclude_patterns:
-        if pattern in name or pattern in description:
-            logger.debug(f"Excluding {server.get('name')} - appears to be {pattern}")
-            return False
+    match = _EXCLUDE_PATTERN.search(name) or _EXCLUDE_PATTERN.search(description)
+    if match:
+        logger.debug("Excluding %s - appears to be %s", server.get('name'), match.group(0))
+        return False
     
     return True
 
-def convert_to_server_format(discovered_server: Dict) -> Optional[Dict]:
-    """Convert discovered server to our database format."""
+def convert_to_server_format(discovered_server: Dict, today: str, timestamp: str) -> Optional[Dict]:
+    """Convert discovered server to our database format.
+    
+    ``today`` (YYYY-MM-DD) and ``timestamp`` (YYYY-MM-DDTHH:MM:SSZ) are
+    computed once per run by the caller.
+    """
     try:
         name = discovered_server.get('name', '').strip()
         if not name:
             return None
         
         # Generate a slug from the name
-        slug = re.sub(r'[^a-zA-Z0-9-]', '-', name.lower()).strip('-')
-        slug = re.sub(r'-+', '-', slug)  # Remove multiple consecutive dashes
+        slug = generate_slug(name)
         
         # Determine category based on maintainer and characteristics
         maintainer = discovered_server.get('maintainer', {})
@@ -162,33 +219,15 @@ def convert_to_server_format(discovered_server: Dict) -> Optional[Dict]:
             "versions": [
                 {
                     "version": version,
-                    "release_date": datetime.now(timezone.utc).strftime('%Y-%m-%d'),
+                    "release_date": today,
                     "security_status": "under-review",
                     "is_recommended": False,
                     "security_scan": {
-                        "scan_date": datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
-                        "scanner_version": "1.2.0",
-                        "static_analysis": {
-                            "status": "not-applicable",
-                            "details": "Security scan not yet performed",
-                            "score": 50,
-                            "issues_found": 0
-                        },
-                        "dependency_scan": {
-                            "status": "not-applicable",
-                            "details": "Dependency scan not yet performed",
-                            "score": 50,
-                            "issues_found": 0
-                        },
-                        "tool_poisoning_check": {
-                            "status": "not-applicable",
-                            "details": "MCP security scan not yet performed",
-                            "score": 50,
-                            "issues_found": 0
-                        },
+                        "scan_date": timestamp,
+                        **copy.deepcopy(_PENDING_SCAN_RESULTS),
                         "manual_review": {
                             "reviewer": "automated-discovery",
-                            "review_date": datetime.now(timezone.utc).strftime('%Y-%m-%d'),
+                            "review_date": today,
                             "architecture_review": {
                                 "status": "pass",
                                 "details": f"Discovered via automated system - discovery score: {discovered_server.get('discovery_score', 0)}",
@@ -216,10 +255,8 @@ def determine_category(server: Dict, maintainer: Dict) -> str:
     maintainer_name = maintainer.get('name', '').lower()
     repo_url = server.get('repository', '').lower()
     
-    # Official/Enterprise indicators
-    official_orgs = ['anthropic', 'github', 'microsoft', 'google', 'aws', 'stripe', 'notion']
-    
-    if any(org in maintainer_name or org in repo_url for org in official_orgs):
+    # Official/Enterprise indicators, checked in one pass over both fields
+    if _OFFICIAL_ORG_PATTERN.search(f"{maintainer_name}\n{repo_url}"):
         return 'enterprise'
     
     # High-quality community projects
@@ -245,17 +282,20 @@ def generate_tags(server: Dict) -> List[str]:
     keywords = server.get('keywords', [])
     topics = server.get('topics', [])
     
-    all_keywords = keywords + topics
-    
-    # Filter and add relevant keywords
+    # Filter and add relevant keywords, skipping duplicates
+    seen = set(tags)
     relevant_keywords = []
-    for keyword in all_keywords:
-        if isinstance(keyword, str):
-            keyword = keyword.lower().strip()
-            if keyword and len(keyword) > 2 and keyword not in ['mcp', 'server']:
-                relevant_keywords.append(keyword)
-    
-    tags.extend(relevant_keywords[:5])  # Limit to 5 additional tags
+    for keyword in chain(keywords, topics):
+        if not isinstance(keyword, str):
+            continue
+        keyword = keyword.lower().strip()
+        if len(keyword) > 2 and keyword not in ('mcp', 'server') and keyword not in seen:
+            seen.add(keyword)
+            relevant_keywords.append(keyword)
+            if len(relevant_keywords) == 5:  # Limit to 5 additional tags
+                break
+    
+    tags.extend(relevant_keywords)
     
     # Add source tag
     source = server.get('source')
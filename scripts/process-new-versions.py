@@ -3,10 +3,17 @@
 Process New Versions - Process detected new versions and update servers.json
 """
 import argparse
+import copy
 import json
 import logging
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional - fall back to the standard library json module
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -15,123 +22,148 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Buffer size for writing servers.json
+_WRITE_BUFFER_SIZE = 1 << 20
+
 
 def load_json_file(file_path: str) -> Dict:
     """Load JSON file"""
     try:
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(file_path, 'r') as f:
             return json.load(f)
     except Exception as e:
-        logger.error(f"Error loading {file_path}: {e}")
+        logger.error("Error loading %s: %s", file_path, e)
         raise
 
 
 def save_json_file(data: Dict, file_path: str):
     """Save JSON file"""
     try:
-        with open(file_path, 'w') as f:
+        # Always written with the json module so servers.json stays
+        # byte-stable; json.dump issues many small writes, which a large
+        # buffer batches
+        with open(file_path, 'w', buffering=_WRITE_BUFFER_SIZE) as f:
             json.dump(data, f, indent=2)
-        logger.info(f"Saved updated data to {file_path}")
+        logger.info("Saved updated data to %s", file_path)
     except Exception as e:
-        logger.error(f"Error saving {file_path}: {e}")
+        logger.error("Error saving %s: %s", file_path, e)
         raise
 
 
+# Skeleton for a version that has been detected but not yet scanned
+_NEW_VERSION_TEMPLATE = {
+    "version": None,
+    "release_date": None,
+    "security_status": "under-review",
+    "is_recommended": False,
+    "security_scan": {
+        "scan_date": None,
+        "scanner_version": None,
+        "static_analysis": {
+            "status": "pending",
+            "details": "Awaiting security scan",
+            "score": 0,
+            "issues_found": 0,
+            "tools_used": []
+        },
+        "dependency_scan": {
+            "status": "pending",
+            "details": "Awaiting security scan",
+            "score": 0,
+            "issues_found": 0,
+            "vulnerabilities": {
+                "info": 0,
+                "low": 0,
+                "moderate": 0,
+                "high": 0,
+                "critical": 0,
+                "total": 0
+            }
+        },
+        "tool_poisoning_check": {
+            "status": "pending",
+            "details": "Awaiting security scan",
+            "score": 0,
+            "issues_found": 0
+        },
+        "container_security": {
+            "status": "pending",
+            "details": "Awaiting security scan",
+            "score": 0,
+            "issues_found": 0
+        },
+        "security_documentation": {
+            "status": "pending",
+            "details": "Awaiting security scan",
+            "score": 0,
+            "has_security_md": False,
+            "has_vulnerability_reporting": False
+        },
+        "overall_score": 0,
+        "recommendations": [
+            "New version detected - requires security validation"
+        ]
+    }
+}
+
+
 def create_new_version_entry(new_version: Dict) -> Dict:
     """Create a new version entry for servers.json"""
-    return {
-        "version": new_version['version'],
-        "release_date": new_version['release_date'],
-        "security_status": "under-review",
-        "is_recommended": False,
-        "security_scan": {
-            "scan_date": None,
-            "scanner_version": None,
-            "static_analysis": {
-                "status": "pending",
-                "details": "Awaiting security scan",
-                "score": 0,
-                "issues_found": 0,
-                "tools_used": []
-            },
-            "dependency_scan": {
-                "status": "pending",
-                "details": "Awaiting security scan",
-                "score": 0,
-                "issues_found": 0,
-                "vulnerabilities": {
-                    "info": 0,
-                    "low": 0,
-                    "moderate": 0,
-                    "high": 0,
-                    "critical": 0,
-                    "total": 0
-                }
-            },
-            "tool_poisoning_check": {
-                "status": "pending",
-                "details": "Awaiting security scan",
-                "score": 0,
-                "issues_found": 0
-            },
-            "container_security": {
-                "status": "pending",
-                "details": "Awaiting security scan",
-                "score": 0,
-                "issues_found": 0
-            },
-            "security_documentation": {
-                "status": "pending",
-                "details": "Awaiting security scan",
-                "score": 0,
-                "has_security_md": False,
-                "has_vulnerability_reporting": False
-            },
-            "overall_score": 0,
-            "recommendations": [
-                "New version detected - requires security validation"
-            ]
-        }
-    }
+    entry = copy.deepcopy(_NEW_VERSION_TEMPLATE)
+    entry["version"] = new_version['version']
+    entry["release_date"] = new_version['release_date']
+    return entry
 
 
-def update_servers_with_new_versions(servers_data: Dict, new_versions: List[Dict]) -> Dict:
-    """Update servers data with new versions"""
-    updated_servers = servers_data.copy()
+def update_servers_with_new_versions(servers_data: Dict, new_versions: List[Dict],
+                                     now_iso: Optional[str] = None) -> Dict:
+    """Update servers data in place with new versions"""
+    # Group new versions by server so each versions list is spliced once
+    new_versions_by_slug = defaultdict(list)
+    for new_version in new_versions:
+        new_versions_by_slug[new_version['slug']].append(new_version)
     
-    # Create a mapping of slug to server for quick lookup
-    server_map = {server['slug']: server for server in updated_servers['servers']}
+    # Map slug to server, only for servers that have new versions
+    server_map = {
+        server['slug']: server
+        for server in servers_data['servers']
+        if server['slug'] in new_versions_by_slug
+    }
     
-    for new_version in new_versions:
-        slug = new_version['slug']
-        
+    for slug, slug_versions in new_versions_by_slug.items():
         if slug not in server_map:
-            logger.warning(f"Server with slug '{slug}' not found in servers.json")
+            logger.warning("Server with slug '%s' not found in servers.json", slug)
             continue
         
         server = server_map[slug]
         
-        # Create new version entry
-        new_version_entry = create_new_version_entry(new_version)
+        # Newest release first; on equal dates the later detection wins
+        slug_versions = sorted(reversed(slug_versions),
+                               key=lambda nv: nv.get('release_date') or '', reverse=True)
         
-        # Add to the beginning of versions list (most recent first)
-        server['versions'].insert(0, new_version_entry)
+        # Create new version entries and add them to the beginning of the
+        # versions list in one splice (most recent first)
+        new_entries = [create_new_version_entry(new_version) for new_version in slug_versions]
+        server['versions'][:0] = new_entries
         
-        # Update is_recommended for older versions
-        for i, version_entry in enumerate(server['versions']):
-            if i == 0:
-                # New version gets is_recommended=False until security scan
-                version_entry['is_recommended'] = False
-            else:
-                # Older versions lose recommendation status
+        # New versions are created with is_recommended=False until scanned;
+        # older versions lose recommendation status
+        for version_entry in server['versions'][len(new_entries):]:
+            if version_entry.get('is_recommended'):
                 version_entry['is_recommended'] = False
         
-        logger.info(f"Added new version {new_version['version']} for {server['name']}")
+        for new_version in slug_versions:
+            logger.info("Added new version %s for %s", new_version['version'], server['name'])
     
     # Update last_updated timestamp
-    updated_servers['last_updated'] = datetime.now(timezone.utc).isoformat()
+    if now_iso is None:
+        now_iso = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    servers_data['last_updated'] = now_iso
     
-    return updated_servers
+    return servers_data
 
 
 def main():
@@ -145,16 +177,22 @@ def main():
     # Load new versions
     new_versions = load_json_file(args.new_versions)
     
+    # Nothing to do: leave the output unwritten so no update PR is created
+    if not new_versions:
+        logger.info("No new versions to process")
+        return
+    
     # Load servers data
     servers_data = load_json_file(args.servers)
     
     # Update servers with new versions
-    updated_servers = update_servers_with_new_versions(servers_data, new_versions)
+    now_iso = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    updated_servers = update_servers_with_new_versions(servers_data, new_versions, now_iso)
     
     # Save updated servers
     save_json_file(updated_servers, args.output)
     
-    logger.info(f"Processed {len(new_versions)} new versions successfully")
+    logger.info("Processed %d new versions successfully", len(new_versions))
 
 
 if __name__ == '__main__':
@@ -15,18 +15,46 @@ Usage:
 """
 
 import argparse
+import contextlib
+import errno
+import hashlib
 import json
 import logging
+import mmap
+import queue
+import shutil
+import sqlite3
 import subprocess
 import tempfile
+import threading
 import os
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
 import requests
 import re
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse
+from urllib3.util.retry import Retry
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; mirrors are then only locked per process
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # optional - fall back to the standard library json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional - fall back to parsing whole tool reports
+    ijson = None
 
 # Configure logging
 logging.basicConfig(
@@ -35,17 +63,397 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+_SCANNER_VERSION = '1.2.0'
+
+# Weight of each check in a version's overall score
+_SCORE_WEIGHTS = (
+    ('static_analysis', 0.15),      # Reduced from 0.20
+    ('dependency_scan', 0.25),      # Unchanged
+    ('mcp_security_scan', 0.60)     # Increased from 0.35 - primary focus
+)
+
+# Recommendation for each check scoring below 80. Container and documentation
+# checks are no longer part of scoring, so they have no recommendation.
+_CHECK_RECOMMENDATIONS = (
+    ('static_analysis', "Address static analysis security findings"),
+    ('dependency_scan', "Update dependencies to fix known vulnerabilities"),
+    ('mcp_security_scan', "Address MCP-specific security issues identified by mcp-scan")
+)
+
+# External analyzers, located on PATH once per scanner
+_EXTERNAL_TOOLS = ('bandit', 'semgrep', 'eslint', 'safety', 'npm')
+
+# Scan results in the opt-in --cache-file are reused for 24 hours
+_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Files whose contents determine a dependency scan result
+_DEPENDENCY_FILES = (
+    'package.json', 'package-lock.json', 'requirements.txt', 'poetry.lock',
+    'go.mod', 'go.sum', 'Cargo.lock'
+)
+
+# Repositories per GraphQL query when resolving tags and default branches up front
+_GRAPHQL_BATCH_SIZE = 50
+
+# Repository mirrors (--mirror-dir) are refreshed when older than an hour
+_MIRROR_MAX_AGE_SECONDS = 60 * 60
+
+# Long-lived ESLint process that lints repositories on request, and the
+# critical-only rules it and the eslint command use
+_ESLINT_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'eslint-worker.js')
+_ESLINT_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'eslint-critical.json')
+
+# Upper bound on the time spent running mcp-scan for one version
+_MCP_SCAN_TOTAL_TIMEOUT = 600
+
+# Largest JSON report read from an external tool; anything bigger is
+# treated as a failed run rather than parsed
+_MAX_TOOL_OUTPUT_BYTES = 64 * 1024 * 1024
+
+# Directories that hold dependencies, VCS data or build output rather than
+# the server's own code; every walk of a repository skips them
+_IGNORED_DIRS = frozenset({
+    '.git', 'node_modules', 'venv', '.venv', 'dist', 'build',
+    '__pycache__', '.tox', 'target', 'vendor'
+})
+
+# Dockerfiles and READMEs are only checked within their first 256 KB, and
+# READMEs over 2 MB are skipped altogether
+_MAX_TEXT_CHECK_BYTES = 256 * 1024
+_MAX_README_BYTES = 2 * 1024 * 1024
+_SECURITY_README_KEYWORDS = (b'security', b'authentication', b'authorization', b'permissions')
+
+# Ports published by a Dockerfile
+_EXPOSE_PORT = re.compile(rb'EXPOSE\s+(\d+)')
+
+# Root files that identify a repository's primary language, checked in order
+_LANGUAGE_MARKERS = (
+    ('requirements.txt', 'python'),
+    ('setup.py', 'python'),
+    ('pyproject.toml', 'python'),
+    ('go.mod', 'go'),
+    ('go.sum', 'go'),
+    ('Cargo.toml', 'rust'),
+    ('pom.xml', 'java'),
+    ('build.gradle', 'java'),
+    ('tsconfig.json', 'typescript'),
+    ('package.json', 'javascript')
+)
+
+# Source file extensions used when no marker file is present
+_LANGUAGE_BY_EXTENSION = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.go': 'go',
+    '.rs': 'rust',
+    '.java': 'java'
+}
+
+# MCP configuration file names. Directory-based configs (config/mcp.json,
+# .claude/config.json, ...) end in one of these names as well.
+_MCP_CONFIG_NAMES = frozenset({
+    # Standard MCP configs
+    'mcp.json',
+    'mcp_config.json',
+    '.mcp.json',
+    'mcp-config.json',
+    
+    # Claude Desktop configs
+    'claude_desktop_config.json',
+    '.claude_desktop_config.json',
+    
+    # Tool-specific configs
+    'tools.json',
+    'server.json',
+    'mcp_server.json',
+    'mcp-server.json',
+    
+    # Environment configs
+    '.env.mcp',
+    'mcp.env',
+    'config.json',  # Generic but might contain MCP
+    
+    # YAML variants
+    'mcp.yaml',
+    'mcp.yml',
+    'mcp_config.yaml',
+    'mcp-config.yml'
+})
+_MCP_CONFIG_SUFFIX = '.mcp.json'
+
+# Other JSON/YAML files count as MCP configs if one of these appears in
+# their first 1000 characters (lowercased); up to 4 bytes per character
+_MCP_CONTENT_KEYWORDS = ('"mcp"', '"tools"', '"claude"', '"server"', 'mcpServers')
+_MCP_CONTENT_HEAD_CHARS = 1000
+_MCP_CONTENT_HEAD_BYTES = 4 * _MCP_CONTENT_HEAD_CHARS
+
+# Basic patterns for tool poisoning
+_POISONING_PATTERNS = (
+    r'ignore\s+previous\s+instructions',
+    r'disregard\s+.+\s+above',
+    r'forget\s+everything',
+    r'new\s+instructions',
+    r'override\s+security',
+    r'bypass\s+restrictions'
+)
+_POISONING_REGEXES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in _POISONING_PATTERNS)
+
+# All poisoning patterns as one expression, so most files are searched once.
+# Always the re module: google-re2's \s leaves out \v, \x1c-\x1f and Unicode
+# spaces, so a payload using them would pass an re2 prefilter unflagged.
+_POISONING_PREFILTER = re.compile(
+    '(?i)' + '|'.join(f'(?:{pattern})' for pattern in _POISONING_PATTERNS)
+)
+
+# The same expression for ASCII-only files, searched on the raw bytes. In text
+# \s also matches the \x1c-\x1f separators, so the byte pattern includes them.
+_POISONING_PREFILTER_ASCII = re.compile(
+    _POISONING_PREFILTER.pattern.replace('\\s', '[\\s\\x1c-\\x1f]').encode()
+)
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+# Directories already created by _ensure_dir in this process
+_ensured_dirs = set()
+_ensured_dirs_lock = threading.Lock()
+
+
+def _analyzer_jobs(concurrent_scans: int) -> int:
+    """Worker processes per analyzer run, sharing the CPUs between concurrent scans."""
+    return max(1, (os.cpu_count() or 1) // max(1, concurrent_scans))
+
+
+def _ensure_dir(path: str):
+    """Create directory path if needed; each directory is only checked once per process."""
+    if not path:
+        return
+    with _ensured_dirs_lock:
+        if path not in _ensured_dirs:
+            os.makedirs(path, exist_ok=True)
+            _ensured_dirs.add(path)
+
+
+def _run_capped(cmd: List[str], timeout: float, cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+    """Run cmd like subprocess.run, capturing at most _MAX_TOOL_OUTPUT_BYTES of stdout."""
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    timed_out = threading.Event()
+    
+    def kill():
+        timed_out.set()
+        proc.kill()
+    
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    output = bytearray()
+    try:
+        while len(output) <= _MAX_TOOL_OUTPUT_BYTES:
+            chunk = proc.stdout.read1(1 << 16)
+            if not chunk:
+                break
+            output += chunk
+        else:
+            proc.kill()
+    finally:
+        proc.stdout.close()
+        proc.wait()
+        timer.cancel()
+    
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    if len(output) > _MAX_TOOL_OUTPUT_BYTES:
+        raise RuntimeError(f'{os.path.basename(cmd[0])} output exceeded {_MAX_TOOL_OUTPUT_BYTES >> 20} MiB')
+    return subprocess.CompletedProcess(cmd, proc.returncode, bytes(output))
+
+
+def _parse_json_output(output: bytes):
+    """Parse a tool's JSON output directly from the captured bytes."""
+    return orjson.loads(output) if orjson is not None else json.loads(output)
+
+
+def _dump_json(data, indent: bool = True) -> bytes:
+    """Serialize data to JSON bytes, indented by two spaces unless indent is False."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(data, indent=2 if indent else None).encode()
+
+
+def _has_mcp_content(file_path: str) -> bool:
+    """Check the start of file_path for MCP-specific keywords."""
+    # Only the head is read, however large the file is
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        head = os.read(fd, _MCP_CONTENT_HEAD_BYTES)
+    finally:
+        os.close(fd)
+    
+    # Same text as reading the file in text mode and keeping the first 1000 characters
+    text = head.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+    text = text[:_MCP_CONTENT_HEAD_CHARS].lower()
+    return any(keyword in text for keyword in _MCP_CONTENT_KEYWORDS)
+
+
+def _poisoning_candidate_text(file_path: str) -> Optional[str]:
+    """Return the text of file_path if it may contain a poisoning pattern, else None."""
+    # Empty files cannot be memory-mapped (and match nothing); every other
+    # file is searched whatever its size, so padding cannot hide a payload
+    if os.path.getsize(file_path) == 0:
+        return None
+    
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if _NON_ASCII.search(mm) is None:
+            # Pure ASCII: most files are ruled out without decoding or copying
+            if _POISONING_PREFILTER_ASCII.search(mm) is None:
+                return None
+            content = mm[:].decode('ascii')
+        else:
+            content = mm[:].decode('utf-8', errors='ignore')
+    
+    # Match what reading the file in text mode gives (universal newlines)
+    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content if _POISONING_PREFILTER.search(content) else None
+
+
+def _poisoning_file_matches(file_path: str) -> List[str]:
+    """Return the poisoning patterns found in file_path (unreadable files have none)."""
+    try:
+        # Only files matching some pattern need the per-pattern search
+        content = _poisoning_candidate_text(file_path)
+    except Exception:
+        return []
+    if content is None:
+        return []
+    return [pattern for pattern, regex in zip(_POISONING_PATTERNS, _POISONING_REGEXES)
+            if regex.search(content)]
+
+
+def _github_owner_repo(repo_url: str) -> Optional[Tuple[str, str]]:
+    """Return (owner, repo) for a GitHub repository URL, or None for other URLs."""
+    parsed = urlparse(repo_url)
+    path_parts = parsed.path.strip('/').split('/')
+    if 'github.com' not in parsed.netloc or len(path_parts) < 2:
+        return None
+    return path_parts[0], path_parts[1]
+
+
+def _count_eslint_errors(report: List[Dict]) -> int:
+    """Count error-level (critical) messages in an ESLint JSON report."""
+    return sum(1 for file in report for message in file.get('messages', [])
+               if message.get('severity', 0) == 2)
+
+
+def _stop_eslint_worker(worker: Tuple[subprocess.Popen, queue.Queue]):
+    """Stop an ESLint worker process; its reader thread ends at end of file."""
+    process, _ = worker
+    process.kill()
+    process.wait()
+
+
+def _eslint_node_modules(eslint_path: Optional[str]) -> Optional[str]:
+    """Return the node_modules directory the eslint command is installed in, if any."""
+    if not eslint_path:
+        return None
+    # e.g. /usr/local/bin/eslint -> /usr/local/lib/node_modules/eslint/bin/eslint.js
+    path = os.path.dirname(os.path.realpath(eslint_path))
+    while os.path.basename(path) != 'node_modules':
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    return path
+
+
 class SecurityScanner:
     """Main security scanner class for MCP servers."""
     
-    def __init__(self, github_token: Optional[str] = None):
+    def __init__(self, github_token: Optional[str] = None, jobs: int = 1,
+                 cache_path: Optional[str] = None, mirror_dir: Optional[str] = None,
+                 commit_shas: Optional[Dict[str, Optional[str]]] = None,
+                 analyzer_jobs: Optional[int] = None):
         self.github_token = github_token
-        self.session = requests.Session()
-        if github_token:
-            self.session.headers.update({
-                'Authorization': f'token {github_token}',
-                'Accept': 'application/vnd.github.v3+json'
-            })
+        self.jobs = max(1, jobs)
+        # bandit and semgrep jobs per run, so concurrent scans don't oversubscribe the CPUs
+        self._analyzer_jobs = analyzer_jobs or _analyzer_jobs(self.jobs)
+        self._local = threading.local()
+        self._tools = {tool: shutil.which(tool) for tool in _EXTERNAL_TOOLS}
+        self._bandit_has_jobs: Optional[bool] = None
+        self._eslint_available: Optional[bool] = None
+        self._mcp_scan_cmd: Optional[List[str]] = None
+        self._cache = self._open_cache(cache_path) if cache_path else None
+        self._cache_lock = threading.Lock()
+        self.mirror_dir = mirror_dir
+        self._commit_shas = commit_shas or {}
+        self._mirror_locks: Dict[str, threading.Lock] = {}
+        self._mirror_locks_guard = threading.Lock()
+        self._repo_listings: Dict[str, List[Tuple[str, List[str]]]] = {}
+        # Idle ESLint workers; each scan thread takes one, or starts one if none is idle
+        self._eslint_workers: List[Tuple[subprocess.Popen, queue.Queue]] = []
+        self._eslint_workers_lock = threading.Lock()
+        self._eslint_worker_failed = False
+    
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session for the current thread (sessions are not shared between threads)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            # Retry dropped connections and transient GitHub errors on the
+            # pooled connection instead of failing the lookup or download
+            session.mount('https://', HTTPAdapter(max_retries=Retry(
+                total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False
+            )))
+            if self.github_token:
+                session.headers.update({
+                    'Authorization': f'token {self.github_token}',
+                    'Accept': 'application/vnd.github.v3+json'
+                })
+            self._local.session = session
+        return session
+    
+    def _open_cache(self, cache_path: str) -> Optional[sqlite3.Connection]:
+        """Open (creating if needed) the SQLite result cache, or None if unavailable."""
+        try:
+            _ensure_dir(os.path.dirname(cache_path))
+            # Scanner threads share the connection under _cache_lock; worker
+            # processes each open their own and wait on each other's writes
+            connection = sqlite3.connect(cache_path, timeout=30, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts INTEGER, payload BLOB)'
+            )
+            connection.commit()
+            return connection
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Scan cache disabled, could not open {cache_path}: {e}")
+            return None
+    
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for key if it is still fresh."""
+        if self._cache is None:
+            return None
+        try:
+            with self._cache_lock:
+                row = self._cache.execute(
+                    'SELECT payload FROM cache WHERE key = ? AND ts > ?',
+                    (key, int(time.time()) - _CACHE_TTL_SECONDS)
+                ).fetchone()
+            return _parse_json_output(row[0]) if row else None
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Scan cache lookup failed: {e}")
+            return None
+    
+    def _cache_put(self, key: str, result: Dict):
+        """Store a result in the cache."""
+        if self._cache is None:
+            return
+        try:
+            with self._cache_lock:
+                self._cache.execute(
+                    'INSERT OR REPLACE INTO cache (key, ts, payload) VALUES (?, ?, ?)',
+                    (key, int(time.time()), _dump_json(result, indent=False))
+                )
+                self._cache.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Scan cache update failed: {e}")
     
     def scan_server(self, server: Dict) -> Dict:
         """Perform comprehensive security scan of a single MCP server."""
@@ -56,13 +464,23 @@ class SecurityScanner:
             'server_slug': server['slug'],
             'repository': server['repository'],
             'scan_timestamp': datetime.now(timezone.utc).isoformat(),
-            'scanner_version': '1.2.0',
+            'scanner_version': _SCANNER_VERSION,
             'versions': []
         }
         
-        for version_info in server.get('versions', []):
-            version_scan = self._scan_version(server, version_info)
-            scan_results['versions'].append(version_scan)
+        versions = server.get('versions', [])
+        
+        # Versions are scanned independently and mostly wait on subprocesses
+        # and the network, so they can overlap in threads
+        if self.jobs > 1 and len(versions) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(versions))) as executor:
+                scan_results['versions'] = list(
+                    executor.map(lambda version_info: self._scan_version(server, version_info), versions)
+                )
+        else:
+            for version_info in versions:
+                version_scan = self._scan_version(server, version_info)
+                scan_results['versions'].append(version_scan)
         
         return scan_results
     
@@ -71,18 +489,39 @@ class SecurityScanner:
         version = version_info['version']
         logger.info(f"Scanning version {version} of {server['name']}")
         
+        # A commit that was scanned recently by this scanner version needs no rescan
+        cache_key = self._version_cache_key(server['repository'], version)
+        if cache_key:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info(f"Using cached scan of {server['name']} {version}")
+                cached['version'] = version
+                return cached
+        
         # Download repository for analysis
         repo_path = self._download_repository(server['repository'], version)
         
-        scan_result = {
-            'version': version,
-            'scan_date': datetime.now(timezone.utc).isoformat(),
-            'static_analysis': self._run_static_analysis(repo_path),
-            'dependency_scan': self._run_dependency_scan(repo_path),
-            'mcp_security_scan': self._run_mcp_scan(repo_path),
-            'overall_score': 0,
-            'recommendations': []
-        }
+        try:
+            scan_date = datetime.now(timezone.utc).isoformat()
+            
+            # Walk the download once; the checks below share the listing
+            if repo_path:
+                self._repo_listings[repo_path] = self._repo_listing(repo_path)
+            
+            scan_result = {
+                'version': version,
+                'scan_date': scan_date,
+                'static_analysis': self._run_static_analysis(repo_path),
+                'dependency_scan': self._run_dependency_scan(repo_path),
+                'mcp_security_scan': self._run_mcp_scan(repo_path),
+                'overall_score': 0,
+                'recommendations': []
+            }
+        finally:
+            # Cleanup temporary files, even if a scan raised
+            if repo_path:
+                self._repo_listings.pop(repo_path, None)
+                shutil.rmtree(repo_path, ignore_errors=True)
         
         # Calculate overall score
         scan_result['overall_score'] = self._calculate_overall_score(scan_result)
@@ -90,14 +529,32 @@ class SecurityScanner:
         # Generate recommendations
         scan_result['recommendations'] = self._generate_recommendations(scan_result)
         
-        # Cleanup temporary files
-        if repo_path and os.path.exists(repo_path):
-            subprocess.run(['rm', '-rf', repo_path], check=False)
+        if cache_key and repo_path:
+            self._cache_put(cache_key, scan_result)
         
         return scan_result
     
+    def _version_cache_key(self, repo_url: str, version: str) -> Optional[str]:
+        """Cache key for a version's scan: the commit it resolves to and the scanner version.
+        
+        Only commits already resolved by the GraphQL prefetch are used, so a
+        cache lookup never costs extra GitHub API requests.
+        """
+        owner_repo = _github_owner_repo(repo_url) if self._cache is not None else None
+        if owner_repo is None:
+            return None
+        owner, repo = owner_repo
+        
+        # Same ref the download uses: tag v{version}, else the default branch
+        tag_key = f'{owner}/{repo}@v{version}'
+        if tag_key not in self._commit_shas:
+            return None
+        sha = self._commit_shas[tag_key] or self._commit_shas.get(f'{owner}/{repo}@HEAD')
+        return f'version-scan:{owner}/{repo}:{sha}:{_SCANNER_VERSION}' if sha else None
+    
     def _download_repository(self, repo_url: str, version: str) -> Optional[str]:
         """Download repository code for analysis."""
+        temp_dir = None
         try:
             # Parse GitHub URL
             parsed = urlparse(repo_url)
@@ -116,17 +573,31 @@ class SecurityScanner:
             # Create temporary directory
             temp_dir = tempfile.mkdtemp(prefix=f"mcp-scan-{repo}-")
             
-            # Clone repository
             clone_url = f"https://github.com/{owner}/{repo}.git"
-            cmd = ['git', 'clone', '--depth', '1', '--branch', f'v{version}', clone_url, temp_dir]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode != 0:
+            # Clone locally from a mirror of the repository when configured
+            if self.mirror_dir:
+                if self._clone_from_mirror(owner, repo, clone_url, version, temp_dir):
+                    logger.info(f"Downloaded repository to: {temp_dir}")
+                    return temp_dir
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                temp_dir = tempfile.mkdtemp(prefix=f"mcp-scan-{repo}-")
+            
+            # Clone repository, skipping the tag attempt when GitHub says it doesn't exist.
+            # Not a GitHub tarball: those come from git archive, which applies the
+            # repository's own export-ignore/export-subst attributes and could hide files.
+            result = None
+            if self._github_tag_exists(owner, repo, f'v{version}') is not False:
+                cmd = ['git', 'clone', '--depth', '1', '--branch', f'v{version}', clone_url, temp_dir]
+                result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            
+            if result is None or result.returncode != 0:
                 # Try without version tag
                 cmd = ['git', 'clone', '--depth', '1', clone_url, temp_dir]
-                result = subprocess.run(cmd, capture_output=True, text=True)
+                result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
                 if result.returncode != 0:
-                    logger.error(f"Failed to clone repository: {result.stderr}")
+                    logger.error(f"Failed to clone repository: {result.stderr.decode('utf-8', 'replace')}")
+                    shutil.rmtree(temp_dir, ignore_errors=True)
                     return None
             
             logger.info(f"Downloaded repository to: {temp_dir}")
@@ -134,8 +605,82 @@ class SecurityScanner:
             
         except Exception as e:
             logger.error(f"Error downloading repository: {e}")
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
             return None
     
+    @contextlib.contextmanager
+    def _mirror_lock(self, mirror: str):
+        """Serialize updates of a mirror across threads and worker processes."""
+        with self._mirror_locks_guard:
+            lock = self._mirror_locks.setdefault(mirror, threading.Lock())
+        with lock, open(f'{mirror}.lock', 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+    
+    def _clone_from_mirror(self, owner: str, repo: str, clone_url: str, version: str, dest: str) -> bool:
+        """Clone tag v{version} (or the default branch) into dest from a local mirror."""
+        mirror = os.path.join(self.mirror_dir, f'{owner}__{repo}.git')
+        try:
+            _ensure_dir(self.mirror_dir)
+            with self._mirror_lock(mirror):
+                if not os.path.isdir(mirror):
+                    result = subprocess.run(['git', 'clone', '--mirror', '--quiet', clone_url, mirror],
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=600)
+                    if result.returncode != 0:
+                        logger.warning(f"Failed to mirror {clone_url}: {result.stderr.decode('utf-8', 'replace').strip()}")
+                        shutil.rmtree(mirror, ignore_errors=True)
+                        return False
+                elif time.time() - os.path.getmtime(mirror) > _MIRROR_MAX_AGE_SECONDS:
+                    result = subprocess.run(['git', '-C', mirror, 'fetch', '--prune', '--quiet'],
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=600)
+                    if result.returncode != 0:
+                        logger.warning(f"Failed to update mirror of {clone_url}: {result.stderr.decode('utf-8', 'replace').strip()}")
+                        return False
+                    os.utime(mirror)
+            
+            # The mirror's refs tell whether the tag exists, so only one clone is needed
+            tag = f'v{version}'
+            has_tag = subprocess.run(
+                ['git', '-C', mirror, 'rev-parse', '--verify', '--quiet', f'refs/tags/{tag}^{{commit}}'],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            ).returncode == 0
+            
+            cmd = ['git', 'clone', '--quiet', '--depth', '1']
+            if has_tag:
+                cmd += ['--branch', tag]
+            cmd += [f'file://{os.path.abspath(mirror)}', dest]
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            if result.returncode != 0:
+                logger.warning(f"Failed to clone from mirror of {clone_url}: {result.stderr.decode('utf-8', 'replace').strip()}")
+                return False
+            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Mirror of {clone_url} unavailable: {e}")
+            return False
+    
+    def _github_tag_exists(self, owner: str, repo: str, tag: str) -> Optional[bool]:
+        """Check for a tag with the GitHub API; None if the API can't tell."""
+        key = f'{owner}/{repo}@{tag}'
+        if key in self._commit_shas:
+            return self._commit_shas[key] is not None
+        
+        try:
+            response = self.session.get(
+                f'https://api.github.com/repos/{owner}/{repo}/git/ref/tags/{tag}', timeout=30
+            )
+        except requests.RequestException as e:
+            logger.debug(f"Tag lookup failed for {owner}/{repo}: {e}")
+            return None
+        
+        if response.status_code == 200:
+            return True
+        if response.status_code == 404:
+            return False
+        # Rate limited or other errors: let git find out
+        return None
+    
     def _run_static_analysis(self, repo_path: str) -> Dict:
         """Run focused static code analysis for critical vulnerabilities only."""
         if not repo_path or not os.path.exists(repo_path):
@@ -178,6 +723,15 @@ class SecurityScanner:
         if not repo_path or not os.path.exists(repo_path):
             return {'status': 'not-applicable', 'details': 'Repository not available', 'score': 50}
         
+        # Identical manifests and lockfiles give the same audit result (for this scanner version)
+        fingerprint = self._lockfile_fingerprint(repo_path)
+        cache_key = f'dependency-scan:{fingerprint}:{_SCANNER_VERSION}' if fingerprint else None
+        if cache_key:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                logger.info("Using cached dependency scan result")
+                return cached
+        
         results = {
             'status': 'pass',
             'details': 'No vulnerabilities found in dependencies',
@@ -189,16 +743,21 @@ class SecurityScanner:
         try:
             # Check for different package managers
             if os.path.exists(os.path.join(repo_path, 'package.json')):
-                results.update(self._scan_npm_dependencies(repo_path))
+                scan_result = self._scan_npm_dependencies(repo_path)
             elif os.path.exists(os.path.join(repo_path, 'requirements.txt')):
-                results.update(self._scan_python_dependencies(repo_path))
+                scan_result = self._scan_python_dependencies(repo_path)
             elif os.path.exists(os.path.join(repo_path, 'go.mod')):
-                results.update(self._scan_go_dependencies(repo_path))
+                scan_result = self._scan_go_dependencies(repo_path)
             else:
-                results.update({
+                scan_result = {
                     'status': 'not-applicable',
                     'details': 'No recognized dependency files found'
-                })
+                }
+            results.update(scan_result)
+            
+            # Only cache completed audits, not missing tools or parse failures
+            if cache_key and 'issues_found' in scan_result:
+                self._cache_put(cache_key, results)
         
         except Exception as e:
             logger.error(f"Dependency scan failed: {e}")
@@ -210,6 +769,31 @@ class SecurityScanner:
         
         return results
     
+    def _lockfile_fingerprint(self, repo_path: str) -> Optional[str]:
+        """Hash the repository's dependency manifests and lockfiles (None if there are none)."""
+        digest = hashlib.blake2b(digest_size=16)
+        found = False
+        for name in _DEPENDENCY_FILES:
+            try:
+                with open(os.path.join(repo_path, name), 'rb') as f:
+                    content = f.read()
+            except OSError:
+                continue
+            found = True
+            digest.update(f'{name}:{len(content)}:'.encode())
+            digest.update(content)
+        return digest.hexdigest() if found else None
+    
+    def _mcp_scan_cache_key(self, config_file: str) -> Optional[str]:
+        """Cache key for an MCP config's scan result: its content and the scanner version (None without a cache)."""
+        if self._cache is None:
+            return None
+        try:
+            with open(config_file, 'rb') as f:
+                return f"mcp-scan:{hashlib.blake2b(f.read(), digest_size=16).hexdigest()}:{_SCANNER_VERSION}"
+        except OSError:
+            return None
+    
     def _run_mcp_scan(self, repo_path: str) -> Dict:
         """Run mcp-scan for MCP-specific security analysis."""
         if not repo_path or not os.path.exists(repo_path):
@@ -233,13 +817,25 @@ class SecurityScanner:
         
         try:
             # Run mcp-scan on found configuration files with enhanced options
+            deadline = time.monotonic() + _MCP_SCAN_TOTAL_TIMEOUT
             for config_file in mcp_config_files:
-                cmd = ['uvx', 'mcp-scan@latest', 'scan', '--json', '--local-only', '--verbose', config_file]
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+                # Configs scanned before with the same content reuse the stored result
+                cache_key = self._mcp_scan_cache_key(config_file)
+                cached = self._cache_get(cache_key) if cache_key else None
+                if cached is not None:
+                    results['scan_results'][config_file] = cached
+                    results['issues_found'] += cached['total_issues']
+                    continue
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired('mcp-scan', _MCP_SCAN_TOTAL_TIMEOUT)
+                cmd = [*self._mcp_scan_command(), 'scan', '--json', '--local-only', '--verbose', config_file]
+                result = subprocess.run(cmd, capture_output=True, timeout=min(120, remaining))
                 
                 if result.returncode == 0:
                     try:
-                        scan_output = json.loads(result.stdout)
+                        scan_output = _parse_json_output(result.stdout)
                         
                         # Parse mcp-scan results with severity breakdown
                         if 'results' in scan_output:
@@ -276,6 +872,8 @@ class SecurityScanner:
                             }
                             
                             results['issues_found'] += issues_found
+                            if cache_key:
+                                self._cache_put(cache_key, results['scan_results'][config_file])
                     
                     except json.JSONDecodeError:
                         logger.warning(f"Could not parse mcp-scan output for {config_file}")
@@ -285,7 +883,7 @@ class SecurityScanner:
                 
                 else:
                     # Log error but continue with other configs
-                    error_msg = result.stderr.strip() if result.stderr else 'Unknown error'
+                    error_msg = result.stderr.decode(errors='replace').strip() if result.stderr else 'Unknown error'
                     logger.warning(f"MCP-scan failed for {config_file}: {error_msg}")
                     results['scan_results'][config_file] = {
                         'error': f'Scan failed: {error_msg}'
@@ -339,12 +937,12 @@ class SecurityScanner:
             try:
                 # Try to install mcp-scan explicitly
                 install_cmd = ['uvx', 'install', 'mcp-scan@latest']
-                subprocess.run(install_cmd, capture_output=True, text=True, timeout=60)
+                subprocess.run(install_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60)
                 
                 # Retry mcp-scan with simplified command
                 for config_file in mcp_config_files:
                     cmd = ['uvx', 'run', 'mcp-scan', 'scan', '--json', config_file]
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+                    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=120)
                     if result.returncode == 0:
                         logger.info("Successfully ran mcp-scan after installation")
                         # Process results (simplified for retry)
@@ -369,89 +967,48 @@ class SecurityScanner:
         
         return results
     
+    def _mcp_scan_command(self) -> List[str]:
+        """Command that runs mcp-scan, resolved once per scanner."""
+        if self._mcp_scan_cmd is None:
+            # An installed mcp-scan saves uvx resolving the package on every run
+            executable = shutil.which('mcp-scan')
+            self._mcp_scan_cmd = [executable] if executable else ['uvx', 'mcp-scan@latest']
+        return self._mcp_scan_cmd
+    
+    def _repo_listing(self, repo_path: str) -> List[Tuple[str, List[str]]]:
+        """(directory, file names) pairs for the repository, skipping ignored directories."""
+        listing = self._repo_listings.get(repo_path)
+        if listing is None:
+            listing = []
+            for root, dirs, files in os.walk(repo_path):
+                dirs[:] = [d for d in dirs if d not in _IGNORED_DIRS]
+                listing.append((root, files))
+        return listing
+    
     def _find_mcp_configs(self, repo_path: str) -> List[str]:
         """Find MCP configuration files in the repository."""
         config_files = []
         
-        # Expanded MCP configuration file patterns
-        config_patterns = [
-            # Standard MCP configs
-            'mcp.json',
-            'mcp_config.json',
-            '.mcp.json',
-            'mcp-config.json',
-            
-            # Directory-based configs
-            'config/mcp.json',
-            'configs/mcp.json',
-            '.config/mcp.json',
-            'src/config/mcp.json',
-            
-            # Claude Desktop configs
-            'claude_desktop_config.json',
-            '.claude/config.json',
-            'claude/config.json',
-            '.claude_desktop_config.json',
-            
-            # Wildcard patterns
-            '*.mcp.json',
-            '*mcp*.json',
-            
-            # Tool-specific configs
-            'tools.json',
-            'server.json',
-            'mcp_server.json',
-            'mcp-server.json',
-            
-            # Environment configs
-            '.env.mcp',
-            'mcp.env',
-            'config.json',  # Generic but might contain MCP
-            
-            # YAML variants
-            'mcp.yaml',
-            'mcp.yml',
-            'mcp_config.yaml',
-            'mcp-config.yml'
-        ]
-        
-        for root, dirs, files in os.walk(repo_path):
+        for root, files in self._repo_listing(repo_path):
             for file in files:
                 file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(file_path, repo_path)
                 
-                # Check if file matches any config pattern
-                for pattern in config_patterns:
-                    if pattern.startswith('*') and pattern.endswith('*'):
-                        # Handle patterns like *mcp*.json
-                        pattern_core = pattern[1:-5]  # Remove * and .json
-                        if pattern_core in file.lower() and file.endswith('.json'):
-                            config_files.append(file_path)
-                            break
-                    elif pattern.startswith('*'):
-                        # Handle patterns like *.mcp.json
-                        if file.endswith(pattern[1:]):
-                            config_files.append(file_path)
-                            break
-                    elif file == pattern or relative_path == pattern:
-                        config_files.append(file_path)
-                        break
+                # Known MCP configuration file names
+                if file in _MCP_CONFIG_NAMES or file.endswith(_MCP_CONFIG_SUFFIX):
+                    config_files.append(file_path)
+                    continue
                 
                 # Additional heuristics for MCP-related files
-                if not any(file_path in config_files for _ in [True]):
-                    file_lower = file.lower()
-                    if (file.endswith(('.json', '.yaml', '.yml')) and 
-                        ('mcp' in file_lower or 'claude' in file_lower or 'server' in file_lower)):
-                        # Read file to check for MCP-specific content
-                        try:
-                            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()[:1000]  # Read first 1KB
-                                if any(keyword in content.lower() for keyword in 
-                                      ['"mcp"', '"tools"', '"claude"', '"server"', 'mcpServers']):
-                                    config_files.append(file_path)
-                                    break
-                        except Exception:
-                            pass
+                file_lower = file.lower()
+                if (file.endswith(('.json', '.yaml', '.yml')) and 
+                    ('mcp' in file_lower or 'claude' in file_lower or 'server' in file_lower)):
+                    # Read file to check for MCP-specific content
+                    try:
+                        if _has_mcp_content(file_path):
+                            config_files.append(file_path)
+                            break
+                    except Exception:
+                        pass
         
         return config_files
     
@@ -465,36 +1022,21 @@ class SecurityScanner:
             'suspicious_patterns': []
         }
         
-        # Basic patterns for tool poisoning
-        poisoning_patterns = [
-            r'ignore\s+previous\s+instructions',
-            r'disregard\s+.+\s+above',
-            r'forget\s+everything',
-            r'new\s+instructions',
-            r'override\s+security',
-            r'bypass\s+restrictions'
-        ]
-        
         try:
-            suspicious_files = []
-            
-            # Search for suspicious patterns in MCP-related files
-            for root, dirs, files in os.walk(repo_path):
+            # Collect MCP-related files first, then read and search them
+            candidate_paths = []
+            for root, files in self._repo_listing(repo_path):
                 for file in files:
                     if file.endswith(('.json', '.yaml', '.yml', '.md', '.txt')):
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                                content = f.read()
-                                
-                                for pattern in poisoning_patterns:
-                                    if re.search(pattern, content, re.IGNORECASE):
-                                        suspicious_files.append({
-                                            'file': os.path.relpath(file_path, repo_path),
-                                            'pattern': pattern
-                                        })
-                        except Exception:
-                            continue
+                        candidate_paths.append(os.path.join(root, file))
+            
+            matches = [_poisoning_file_matches(path) for path in candidate_paths]
+            
+            suspicious_files = [
+                {'file': os.path.relpath(file_path, repo_path), 'pattern': pattern}
+                for file_path, patterns in zip(candidate_paths, matches)
+                for pattern in patterns
+            ]
             
             if suspicious_files:
                 results.update({
@@ -541,21 +1083,21 @@ class SecurityScanner:
         try:
             # Basic Dockerfile security checks
             if os.path.exists(dockerfile_path):
-                with open(dockerfile_path, 'r') as f:
-                    dockerfile_content = f.read()
+                with open(dockerfile_path, 'rb') as f:
+                    dockerfile_content = f.read(_MAX_TEXT_CHECK_BYTES)
                 
                 security_issues = []
                 
                 # Check for running as root
-                if 'USER root' in dockerfile_content or 'USER 0' in dockerfile_content:
+                if b'USER root' in dockerfile_content or b'USER 0' in dockerfile_content:
                     security_issues.append('Container runs as root user')
                 
                 # Check for privileged operations
-                if '--privileged' in dockerfile_content:
+                if b'--privileged' in dockerfile_content:
                     security_issues.append('Container requires privileged mode')
                 
                 # Check for exposed ports
-                exposed_ports = re.findall(r'EXPOSE\s+(\d+)', dockerfile_content)
+                exposed_ports = _EXPOSE_PORT.findall(dockerfile_content)
                 if any(int(port) < 1024 for port in exposed_ports):
                     security_issues.append('Container exposes privileged ports')
                 
@@ -621,9 +1163,12 @@ class SecurityScanner:
             readme_path = os.path.join(repo_path, readme)
             if os.path.exists(readme_path):
                 try:
-                    with open(readme_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read().lower()
-                        if any(keyword in content for keyword in ['security', 'authentication', 'authorization', 'permissions']):
+                    # Very large READMEs are generated; skip rather than read them
+                    if os.path.getsize(readme_path) > _MAX_README_BYTES:
+                        continue
+                    with open(readme_path, 'rb') as f:
+                        content = f.read(_MAX_TEXT_CHECK_BYTES).lower()
+                        if any(keyword in content for keyword in _SECURITY_README_KEYWORDS):
                             has_security_in_readme = True
                             results['documentation_found'].append(f"{readme} (security section)")
                 except Exception:
@@ -649,39 +1194,32 @@ class SecurityScanner:
     
     def _detect_language(self, repo_path: str) -> str:
         """Detect the primary programming language of the repository."""
-        language_indicators = {
-            'python': ['requirements.txt', 'setup.py', 'pyproject.toml', '*.py'],
-            'javascript': ['package.json', '*.js'],
-            'typescript': ['package.json', 'tsconfig.json', '*.ts'],
-            'go': ['go.mod', 'go.sum', '*.go'],
-            'rust': ['Cargo.toml', '*.rs'],
-            'java': ['pom.xml', 'build.gradle', '*.java']
-        }
+        # Marker files at the repository root are a single stat each
+        for marker, language in _LANGUAGE_MARKERS:
+            if os.path.exists(os.path.join(repo_path, marker)):
+                return language
         
-        for language, indicators in language_indicators.items():
-            for indicator in indicators:
-                if '*' in indicator:
-                    # Check for file extensions
-                    for root, dirs, files in os.walk(repo_path):
-                        for file in files:
-                            if file.endswith(indicator[1:]):
-                                return language
-                else:
-                    # Check for specific files
-                    if os.path.exists(os.path.join(repo_path, indicator)):
-                        return language
+        # Otherwise use the most common source file extension
+        counts = Counter()
+        for root, files in self._repo_listing(repo_path):
+            for file in files:
+                language = _LANGUAGE_BY_EXTENSION.get(os.path.splitext(file)[1])
+                if language:
+                    counts[language] += 1
         
-        return 'unknown'
+        return counts.most_common(1)[0][0] if counts else 'unknown'
     
     def _run_bandit_critical_only(self, repo_path: str) -> Dict:
         """Run Bandit security scanner focusing on critical vulnerabilities only."""
         try:
             # Focus on high and medium severity issues only
-            cmd = ['bandit', '-r', repo_path, '-f', 'json', '-ll', '-i']  # -ll = only report high/med, -i = show issue numbers
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            cmd = [self._tool_path('bandit'), '-r', repo_path, '-f', 'json', '-ll', '-i']  # -ll = only report high/med, -i = show issue numbers
+            if self._bandit_supports_jobs():
+                cmd += ['-j', str(self._analyzer_jobs)]
+            result = _run_capped(cmd, timeout=300)
             
             try:
-                bandit_output = json.loads(result.stdout) if result.stdout else {'results': []}
+                bandit_output = _parse_json_output(result.stdout) if result.stdout else {'results': []}
                 all_issues = bandit_output.get('results', [])
                 
                 # Count only critical and high severity issues
@@ -729,6 +1267,24 @@ class SecurityScanner:
                 'score': 70
             }
 
+    def _tool_path(self, tool: str) -> str:
+        """Absolute path of an external tool, raising FileNotFoundError if it isn't installed."""
+        path = self._tools.get(tool)
+        if path is None:
+            raise FileNotFoundError(errno.ENOENT, f'{tool} not found on PATH', tool)
+        return path
+    
+    def _bandit_supports_jobs(self) -> bool:
+        """Check once whether the installed Bandit accepts -j/--jobs."""
+        if self._bandit_has_jobs is None:
+            try:
+                result = subprocess.run([self._tool_path('bandit'), '--help'], stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, timeout=30)
+                self._bandit_has_jobs = b'--jobs' in result.stdout
+            except (OSError, subprocess.SubprocessError):
+                self._bandit_has_jobs = False
+        return self._bandit_has_jobs
+
     def _run_bandit(self, repo_path: str) -> Dict:
         """Legacy method - redirects to critical-only version."""
         return self._run_bandit_critical_only(repo_path)
@@ -737,11 +1293,12 @@ class SecurityScanner:
         """Run Semgrep focusing on critical security vulnerabilities only."""
         try:
             # Use security ruleset with focus on critical issues
-            cmd = ['semgrep', '--config=p/security-audit', '--config=p/secrets', '--json', '--severity=ERROR', '--severity=WARNING', repo_path]
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            cmd = [self._tool_path('semgrep'), '--config=p/security-audit', '--config=p/secrets', '--json', '--severity=ERROR', '--severity=WARNING',
+                   '--jobs', str(self._analyzer_jobs), repo_path]
+            result = _run_capped(cmd, timeout=300)
             
             try:
-                semgrep_output = json.loads(result.stdout) if result.stdout else {'results': []}
+                semgrep_output = _parse_json_output(result.stdout) if result.stdout else {'results': []}
                 all_issues = semgrep_output.get('results', [])
                 
                 # Filter for high-severity issues
@@ -802,11 +1359,11 @@ class SecurityScanner:
         """Scan NPM dependencies for vulnerabilities."""
         try:
             # Run npm audit
-            cmd = ['npm', 'audit', '--json']
-            result = subprocess.run(cmd, cwd=repo_path, capture_output=True, text=True)
+            cmd = [self._tool_path('npm'), 'audit', '--json']
+            result = _run_capped(cmd, timeout=300, cwd=repo_path)
             
             try:
-                audit_output = json.loads(result.stdout)
+                audit_output = _parse_json_output(result.stdout)
                 vulnerabilities = audit_output.get('metadata', {}).get('vulnerabilities', {})
                 
                 total_vulns = sum(vulnerabilities.values()) if isinstance(vulnerabilities, dict) else 0
@@ -865,11 +1422,11 @@ class SecurityScanner:
         """Scan Python dependencies for vulnerabilities."""
         try:
             # Run safety check
-            cmd = ['safety', 'check', '--json', '-r', 'requirements.txt']
-            result = subprocess.run(cmd, cwd=repo_path, capture_output=True, text=True)
+            cmd = [self._tool_path('safety'), 'check', '--json', '-r', 'requirements.txt']
+            result = _run_capped(cmd, timeout=300, cwd=repo_path)
             
             try:
-                safety_output = json.loads(result.stdout)
+                safety_output = _parse_json_output(result.stdout)
                 vulnerabilities = len(safety_output) if isinstance(safety_output, list) else 0
                 
                 if vulnerabilities == 0:
@@ -920,19 +1477,13 @@ class SecurityScanner:
     
     def _calculate_overall_score(self, scan_result: Dict) -> int:
         """Calculate overall security score from individual scan results."""
-        scores = []
-        weights = {
-            'static_analysis': 0.15,      # Reduced from 0.20
-            'dependency_scan': 0.25,      # Unchanged
-            'mcp_security_scan': 0.60     # Increased from 0.35 - primary focus
-        }
-        
         total_weight = 0
         weighted_score = 0
         
-        for check, weight in weights.items():
-            if check in scan_result and 'score' in scan_result[check]:
-                weighted_score += scan_result[check]['score'] * weight
+        for check, weight in _SCORE_WEIGHTS:
+            check_result = scan_result.get(check)
+            if check_result and 'score' in check_result:
+                weighted_score += check_result['score'] * weight
                 total_weight += weight
         
         if total_weight > 0:
@@ -945,16 +1496,10 @@ class SecurityScanner:
         recommendations = []
         
         # Check each scan component for issues
-        if scan_result.get('static_analysis', {}).get('score', 100) < 80:
-            recommendations.append("Address static analysis security findings")
-        
-        if scan_result.get('dependency_scan', {}).get('score', 100) < 80:
-            recommendations.append("Update dependencies to fix known vulnerabilities")
-        
-        if scan_result.get('mcp_security_scan', {}).get('score', 100) < 80:
-            recommendations.append("Address MCP-specific security issues identified by mcp-scan")
-        
-        # Removed container and documentation recommendations as they're no longer part of scoring
+        for check, recommendation in _CHECK_RECOMMENDATIONS:
+            check_result = scan_result.get(check)
+            if check_result and check_result.get('score', 100) < 80:
+                recommendations.append(recommendation)
         
         # General recommendations
         if scan_result.get('overall_score', 100) < 70:
@@ -974,60 +1519,55 @@ class SecurityScanner:
         }
         
         # Check if eslint is available
-        try:
-            subprocess.run(['eslint', '--version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        if not self._eslint_is_available():
             return results
         
         try:
             # Focus on critical security rules only
             cmd = [
-                'eslint',
+                self._tool_path('eslint'),
                 '--ext', '.js,.jsx,.ts,.tsx',
                 '--format', 'json',
                 '--no-eslintrc',  # Don't use project config
-                '--rule', 'no-eval:error',
-                '--rule', 'no-implied-eval:error', 
-                '--rule', 'no-new-func:error',
-                '--rule', 'no-script-url:error',
-                '--rule', 'no-alert:error',
+                '--config', _ESLINT_CONFIG_FILE,
+                # Resolve plugins next to the scanner, not from the scanned repo
+                '--resolve-plugins-relative-to', os.path.dirname(_ESLINT_CONFIG_FILE),
                 repo_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            critical_count = None
+            output = self._lint_with_eslint_worker(repo_path)
+            if output is None and ijson is not None:
+                # Count errors as the report streams in rather than holding all of it
+                critical_count = self._count_eslint_errors_streamed(cmd)
+            elif output is None:
+                output = _run_capped(cmd, timeout=300).stdout
             
-            if result.stdout:
+            if output:
                 try:
-                    output = json.loads(result.stdout)
-                    # Count only error-level issues (critical)
-                    critical_issues = []
-                    for file in output:
-                        for message in file.get('messages', []):
-                            if message.get('severity', 0) == 2:  # Error level
-                                critical_issues.append(message)
-                    
-                    if len(critical_issues) == 0:
-                        results.update({
-                            'status': 'pass',
-                            'details': 'No critical security vulnerabilities found',
-                            'score': 100,
-                            'issues_found': 0,
-                            'critical_issues': 0,
-                            'tools_used': ['eslint-critical']
-                        })
-                    else:
-                        score = max(50, 100 - len(critical_issues) * 10)
-                        results.update({
-                            'status': 'warning' if len(critical_issues) <= 3 else 'fail',
-                            'details': f'Found {len(critical_issues)} critical security issue(s)',
-                            'score': score,
-                            'issues_found': len(critical_issues),
-                            'critical_issues': len(critical_issues),
-                            'tools_used': ['eslint-critical']
-                        })
-                        
+                    critical_count = _count_eslint_errors(_parse_json_output(output))
                 except json.JSONDecodeError:
                     logger.warning("Failed to parse ESLint output")
+            
+            if critical_count == 0:
+                results.update({
+                    'status': 'pass',
+                    'details': 'No critical security vulnerabilities found',
+                    'score': 100,
+                    'issues_found': 0,
+                    'critical_issues': 0,
+                    'tools_used': ['eslint-critical']
+                })
+            elif critical_count:
+                score = max(50, 100 - critical_count * 10)
+                results.update({
+                    'status': 'warning' if critical_count <= 3 else 'fail',
+                    'details': f'Found {critical_count} critical security issue(s)',
+                    'score': score,
+                    'issues_found': critical_count,
+                    'critical_issues': critical_count,
+                    'tools_used': ['eslint-critical']
+                })
                     
         except subprocess.TimeoutExpired:
             logger.warning("ESLint scan timed out")
@@ -1036,6 +1576,126 @@ class SecurityScanner:
             
         return results
 
+    def _eslint_is_available(self) -> bool:
+        """Check once whether a working eslint command is installed."""
+        if self._eslint_available is None:
+            try:
+                self._eslint_available = self._tools['eslint'] is not None and subprocess.run(
+                    [self._tools['eslint'], '--version'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60
+                ).returncode == 0
+            except (OSError, subprocess.SubprocessError):
+                self._eslint_available = False
+        return self._eslint_available
+    
+    def _count_eslint_errors_streamed(self, cmd: List[str]) -> Optional[int]:
+        """Run eslint and count error-level messages while parsing its report incrementally."""
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            proc.kill()
+        
+        timer = threading.Timer(300, kill)
+        timer.start()
+        try:
+            count = sum(1 for message in ijson.items(proc.stdout, 'item.messages.item')
+                        if message.get('severity', 0) == 2)
+        except ijson.JSONError:
+            count = None
+        finally:
+            proc.stdout.close()
+            proc.wait()
+            timer.cancel()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, 300)
+        if count is None:
+            logger.warning("Failed to parse ESLint output")
+        return count
+    
+    def _lint_with_eslint_worker(self, repo_path: str) -> Optional[bytes]:
+        """Lint repo_path with an idle ESLint worker, starting one if none is idle.
+        
+        Returns ESLint's JSON output (empty if ESLint reported an error), or
+        None if the worker is unavailable and the eslint command should be used.
+        """
+        if self._eslint_worker_failed:
+            return None
+        
+        with self._eslint_workers_lock:
+            worker = self._eslint_workers.pop() if self._eslint_workers else None
+        if worker is None:
+            try:
+                worker = self._start_eslint_worker()
+            except OSError:
+                self._eslint_worker_failed = True
+                return None
+        
+        process, replies = worker
+        try:
+            process.stdin.write(_dump_json({'path': repo_path}, indent=False) + b'\n')
+            process.stdin.flush()
+            line = replies.get(timeout=300)
+        except queue.Empty:
+            _stop_eslint_worker(worker)
+            raise subprocess.TimeoutExpired(process.args, 300)
+        except (OSError, ValueError):
+            line = b''
+        
+        if len(line) > _MAX_TOOL_OUTPUT_BYTES:
+            # The rest of the reply is still unread, so the worker can't be reused
+            _stop_eslint_worker(worker)
+            raise RuntimeError(f'eslint output exceeded {_MAX_TOOL_OUTPUT_BYTES >> 20} MiB')
+        
+        if not line:
+            # The worker exited, e.g. because the eslint module can't be found
+            _stop_eslint_worker(worker)
+            self._eslint_worker_failed = True
+            return None
+        
+        with self._eslint_workers_lock:
+            self._eslint_workers.append(worker)
+        
+        if line.startswith(b'{'):
+            logger.warning(f"ESLint scan failed: {_parse_json_output(line).get('error')}")
+            return b''
+        return line
+    
+    def _start_eslint_worker(self) -> Tuple[subprocess.Popen, queue.Queue]:
+        """Start an ESLint worker and a thread that queues its replies."""
+        # Point the worker at the same ESLint install as the eslint command
+        env = None
+        node_modules = _eslint_node_modules(self._tools['eslint'])
+        if node_modules:
+            env = {**os.environ, 'NODE_PATH': node_modules}
+        process = subprocess.Popen(
+            ['node', _ESLINT_WORKER_SCRIPT],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            env=env
+        )
+        
+        # Replies are read on a separate thread so callers can wait with a timeout;
+        # an empty reply means the worker exited
+        replies = queue.Queue()
+        
+        def read_replies():
+            while True:
+                line = process.stdout.readline(_MAX_TOOL_OUTPUT_BYTES + 1)
+                replies.put(line)
+                if not line or len(line) > _MAX_TOOL_OUTPUT_BYTES:
+                    break
+        
+        threading.Thread(target=read_replies, daemon=True).start()
+        return process, replies
+    
+    def close(self):
+        """Stop helper processes started by the scanner."""
+        with self._eslint_workers_lock:
+            workers, self._eslint_workers = self._eslint_workers, []
+        for worker in workers:
+            _stop_eslint_worker(worker)
+    
     def _run_eslint_security(self, repo_path: str) -> Dict:
         """Legacy method - redirects to critical-only version."""
         return self._run_eslint_critical_only(repo_path)
@@ -1045,6 +1705,121 @@ class SecurityScanner:
         return self._run_eslint_critical_only(repo_path)
 
 
+def scan_server_safely(scanner: SecurityScanner, server: Dict) -> Dict:
+    """Scan a server, returning an error result instead of raising."""
+    try:
+        result = scanner.scan_server(server)
+        logger.info(f"Completed scan for {server['name']}")
+        return result
+    except Exception as e:
+        logger.error(f"Failed to scan {server['name']}: {e}")
+        # Add error result
+        return {
+            'server_name': server['name'],
+            'server_slug': server['slug'],
+            'error': str(e),
+            'scan_timestamp': datetime.now(timezone.utc).isoformat()
+        }
+
+
+# Scanner for the current worker process, set up by _init_worker
+_worker_scanner: Optional[SecurityScanner] = None
+
+
+def _prefetch_commit_shas(github_token: str, servers: List[Dict]) -> Dict[str, Optional[str]]:
+    """Resolve every version tag and default branch with batched GitHub GraphQL queries.
+    
+    Keys are '{owner}/{repo}@v{version}' and '{owner}/{repo}@HEAD'; a None value
+    means the tag doesn't exist. Repositories that couldn't be resolved are left
+    out, and the scanner looks them up one request at a time as before.
+    """
+    tags_by_repo: Dict[Tuple[str, str], Dict[str, None]] = {}
+    for server in servers:
+        owner_repo = _github_owner_repo(server.get('repository', ''))
+        if owner_repo is not None:
+            tags = tags_by_repo.setdefault(owner_repo, {})
+            tags.update((f"v{version_info['version']}", None) for version_info in server.get('versions', []))
+    
+    session = requests.Session()
+    session.headers['Authorization'] = f'token {github_token}'
+    repositories = list(tags_by_repo.items())
+    commit_shas = {}
+    
+    for start in range(0, len(repositories), _GRAPHQL_BATCH_SIZE):
+        batch = [(owner, repo, list(tags)) for (owner, repo), tags in repositories[start:start + _GRAPHQL_BATCH_SIZE]]
+        
+        # One aliased repository field per repository, one aliased ref per tag
+        fields = []
+        for i, (owner, repo, tags) in enumerate(batch):
+            refs = ' '.join(
+                f't{j}: ref(qualifiedName: {json.dumps("refs/tags/" + tag)}) '
+                '{ target { oid ... on Tag { target { oid } } } }'
+                for j, tag in enumerate(tags)
+            )
+            fields.append(f'r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) '
+                          f'{{ defaultBranchRef {{ target {{ oid }} }} {refs} }}')
+        
+        try:
+            response = session.post('https://api.github.com/graphql',
+                                    json={'query': '{ ' + ' '.join(fields) + ' }'}, timeout=60)
+            response.raise_for_status()
+            data = _parse_json_output(response.content).get('data') or {}
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Failed to prefetch commits for {len(batch)} repositories: {e}")
+            continue
+        
+        for i, (owner, repo, tags) in enumerate(batch):
+            repository = data.get(f'r{i}')
+            if not repository:
+                continue
+            if repository.get('defaultBranchRef'):
+                commit_shas[f'{owner}/{repo}@HEAD'] = repository['defaultBranchRef']['target']['oid']
+            for j, tag in enumerate(tags):
+                ref = repository.get(f't{j}')
+                # Annotated tags point at a tag object whose target is the commit
+                target = ref and (ref['target'].get('target') or ref['target'])
+                commit_shas[f'{owner}/{repo}@{tag}'] = target['oid'] if target else None
+    
+    return commit_shas
+
+
+def _journal_results(journal: BinaryIO, results: Iterable[Dict]):
+    """Append each result to the journal as one JSON line as soon as it is available."""
+    for result in results:
+        journal.write(_dump_json(result, indent=False) + b'\n')
+        journal.flush()
+
+
+def _write_scan_results(output_path: str, scan_results: Dict, journal_path: str):
+    """Write scan_results with the journaled results, reading one result at a time.
+    
+    The file has the same layout as _dump_json(scan_results) with the results inlined.
+    """
+    head = _dump_json({**scan_results, 'results': []})
+    with open(journal_path, 'rb') as journal, open(output_path, 'wb') as output:
+        wrote_any = False
+        for line in journal:
+            output.write(b',\n    ' if wrote_any else head[:-len(b'[]\n}')] + b'[\n    ')
+            # Each result sits two levels deep in the document
+            output.write(_dump_json(_parse_json_output(line)).replace(b'\n', b'\n    '))
+            wrote_any = True
+        output.write(b'\n  ]\n}' if wrote_any else head)
+
+
+def _init_worker(github_token: Optional[str], cache_path: Optional[str], mirror_dir: Optional[str],
+                 commit_shas: Dict[str, Optional[str]], analyzer_jobs: int):
+    """Create the scanner used by a server-scanning worker process."""
+    global _worker_scanner
+    # Servers already run in parallel, so each worker scans versions serially
+    _worker_scanner = SecurityScanner(github_token, cache_path=cache_path, mirror_dir=mirror_dir,
+                                      commit_shas=commit_shas, analyzer_jobs=analyzer_jobs)
+
+
+def _scan_server_in_worker(server: Dict) -> Dict:
+    """Scan a server with the worker process's scanner."""
+    return scan_server_safely(_worker_scanner, server)
+
+
 def main():
     """Main entry point for the security scanner."""
     parser = argparse.ArgumentParser(
@@ -1075,19 +1850,36 @@ def main():
         help='GitHub token for API access (optional)'
     )
     
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Number of servers (or versions of a single server) to scan in parallel (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--cache-file',
+        help='SQLite file caching scan results for 24 hours (optional, no cache by default)'
+    )
+    
+    parser.add_argument(
+        '--mirror-dir',
+        help='Keep mirrors of scanned repositories here and clone versions from them (optional)'
+    )
+    
     args = parser.parse_args()
     
     # Load server data
     try:
-        with open(args.input, 'r') as f:
-            data = json.load(f)
+        data = _parse_json_output(Path(args.input).read_bytes())
     except Exception as e:
         logger.error(f"Failed to load input file: {e}")
         sys.exit(1)
     
-    # Initialize scanner
+    # Scanner settings
     github_token = args.github_token or os.environ.get('GITHUB_TOKEN')
-    scanner = SecurityScanner(github_token)
+    jobs = max(1, args.jobs)
+    cache_path = args.cache_file
     
     # Filter servers if specific slug provided
     servers_to_scan = data.get('servers', [])
@@ -1100,35 +1892,53 @@ def main():
     # Perform scans
     scan_results = {
         'scan_timestamp': datetime.now(timezone.utc).isoformat(),
-        'scanner_version': '1.2.0',
+        'scanner_version': _SCANNER_VERSION,
         'total_servers_scanned': len(servers_to_scan),
         'results': []
     }
     
-    for server in servers_to_scan:
-        try:
-            result = scanner.scan_server(server)
-            scan_results['results'].append(result)
-            logger.info(f"Completed scan for {server['name']}")
-        except Exception as e:
-            logger.error(f"Failed to scan {server['name']}: {e}")
-            # Add error result
-            scan_results['results'].append({
-                'server_name': server['name'],
-                'server_slug': server['slug'],
-                'error': str(e),
-                'scan_timestamp': datetime.now(timezone.utc).isoformat()
-            })
+    # GraphQL needs a token; without one every lookup is a REST request
+    commit_shas = _prefetch_commit_shas(github_token, servers_to_scan) if github_token else {}
     
-    # Save results
+    # Results are journaled as each server completes, so only one result is held
+    # in memory; the journal is scratch space for this run and is always removed
+    journal_path = f'{args.output}.jsonl'
     try:
-        os.makedirs(os.path.dirname(args.output), exist_ok=True)
-        with open(args.output, 'w') as f:
-            json.dump(scan_results, f, indent=2)
-        logger.info(f"Scan results saved to {args.output}")
-    except Exception as e:
+        _ensure_dir(os.path.dirname(args.output))
+        journal = open(journal_path, 'wb')
+    except OSError as e:
         logger.error(f"Failed to save results: {e}")
         sys.exit(1)
+    
+    try:
+        with journal:
+            if jobs > 1 and len(servers_to_scan) > 1:
+                # Scan servers in worker processes, keeping the input order
+                workers = min(jobs, len(servers_to_scan))
+                with ProcessPoolExecutor(max_workers=workers,
+                                         initializer=_init_worker,
+                                         initargs=(github_token, cache_path, args.mirror_dir,
+                                                   commit_shas, _analyzer_jobs(workers))) as executor:
+                    _journal_results(journal, executor.map(_scan_server_in_worker, servers_to_scan))
+            else:
+                # A single server: overlap its versions in threads instead
+                scanner = SecurityScanner(github_token, jobs=jobs, cache_path=cache_path,
+                                          mirror_dir=args.mirror_dir, commit_shas=commit_shas)
+                try:
+                    _journal_results(journal, (scan_server_safely(scanner, server) for server in servers_to_scan))
+                finally:
+                    scanner.close()
+        
+        # Save results
+        try:
+            _write_scan_results(args.output, scan_results, journal_path)
+            logger.info(f"Scan results saved to {args.output}")
+        except Exception as e:
+            logger.error(f"Failed to save results: {e}")
+            sys.exit(1)
+    finally:
+        with contextlib.suppress(OSError):
+            os.remove(journal_path)
 
 
 if __name__ == '__main__':
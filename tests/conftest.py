@@ -0,0 +1,15 @@
+"""
+Shared helpers for the tests of the standalone scripts under scripts/
+"""
+import importlib.util
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+
+
+def load_script(file_name: str):
+    """Import a script by file name (the hyphenated names are not importable directly)"""
+    spec = importlib.util.spec_from_file_location(file_name[:-3].replace('-', '_'), SCRIPTS_DIR / file_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,56 @@
+"""
+Tests for scripts/check-stale-versions.py
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import load_script
+
+stale_versions = load_script('check-stale-versions.py')
+
+
+@pytest.mark.parametrize('date_str', [
+    '2024-03-05',
+    '2024-03-05T10:20:30',
+    '2024-03-05T10:20:30Z',
+    '2024-03-05T10:20:30.5Z',
+    '2024-03-05T10:20:30.123456Z',
+    '2024-03-05T10:20:30.1234567Z',
+    '2024-03-05T10:20:30+02:00',
+    '2024-03-05T10:20:30.250+00:00',
+])
+def test_parse_iso_matches_fromisoformat(date_str):
+    expected = datetime.fromisoformat(date_str)
+    if expected.tzinfo is None:
+        expected = expected.replace(tzinfo=timezone.utc)
+    assert stale_versions._parse_iso(date_str) == expected
+
+
+def test_parse_iso_is_utc_for_dates():
+    assert stale_versions._parse_iso('2024-03-05') == datetime(2024, 3, 5, tzinfo=timezone.utc)
+
+
+def test_calculate_days_since_update():
+    now = datetime(2024, 3, 15, 12, tzinfo=timezone.utc)
+    assert stale_versions.calculate_days_since_update('2024-03-05', None, now, '2024-03-15') == 10
+    # The scan date takes precedence over the release date
+    assert stale_versions.calculate_days_since_update('2024-01-01', '2024-03-14T00:00:00Z', now, '2024-03-15') == 1
+    # Same-day dates are not parsed
+    assert stale_versions.calculate_days_since_update('2024-03-15', None, now, '2024-03-15') == 0
+    assert stale_versions.calculate_days_since_update('', None, now, '2024-03-15') == 0
+
+
+def test_check_stale_versions_uses_the_given_time():
+    now = datetime(2024, 3, 15, 12, tzinfo=timezone.utc)
+    servers = [
+        {'name': 'Old', 'slug': 'old', 'repository': 'https://github.com/a/old',
+         'versions': [{'version': '1.0.0', 'release_date': '2023-01-01'}]},
+        {'name': 'Rescanned', 'slug': 'rescanned', 'repository': 'https://github.com/a/rescanned',
+         'versions': [{'version': '1.0.0', 'release_date': '2023-01-01',
+                       'security_scan': {'scan_date': '2024-03-01T00:00:00Z'}}]},
+        {'name': 'Empty', 'slug': 'empty', 'repository': 'https://github.com/a/empty', 'versions': []},
+    ]
+    stale = stale_versions.check_stale_versions(servers, 90, now)
+    assert [entry['slug'] for entry in stale] == ['old']
+    assert stale[0]['days_since_update'] == (now - datetime(2023, 1, 1, tzinfo=timezone.utc)).days
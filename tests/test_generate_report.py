@@ -0,0 +1,54 @@
+"""
+Tests for scripts/generate-report.py
+"""
+import pytest
+
+from conftest import load_script
+
+report = load_script('generate-report.py')
+
+
+def original_status(score) -> str:
+    """The if/elif chain that the bisect lookup replaced"""
+    if score >= 85:
+        return 'verified-secure'
+    elif score >= 70:
+        return 'conditional'
+    elif score >= 50:
+        return 'under-review'
+    else:
+        return 'not-recommended'
+
+
+@pytest.mark.parametrize('score, status', [
+    (0, 'not-recommended'),
+    (49, 'not-recommended'),
+    (50, 'under-review'),
+    (69, 'under-review'),
+    (70, 'conditional'),
+    (84, 'conditional'),
+    (85, 'verified-secure'),
+    (100, 'verified-secure'),
+])
+def test_determine_status_from_score(score, status):
+    generator = report.SecurityReportGenerator()
+    assert generator._determine_status_from_score(score) == status
+
+
+def test_determine_status_matches_original_chain():
+    generator = report.SecurityReportGenerator()
+    scores = [-1, 49.99, 69.5, 84.999, 85.0, 101] + list(range(0, 101))
+    for score in scores:
+        assert generator._determine_status_from_score(score) == original_status(score)
+
+
+@pytest.mark.parametrize('status, emoji', [
+    ('verified-secure', '🛡️'),
+    ('conditional', '⚠️'),
+    ('under-review', '🔄'),
+    ('not-recommended', '❌'),
+    ('deprecated', '🗑️'),
+    ('something-else', '❓'),
+])
+def test_get_status_emoji(status, emoji):
+    assert report.SecurityReportGenerator()._get_status_emoji(status) == emoji
@@ -0,0 +1,29 @@
+"""
+Tests for scripts/process-discovered-servers.py
+"""
+import re
+
+import pytest
+
+from conftest import load_script
+
+discovered_servers = load_script('process-discovered-servers.py')
+
+
+def original_slug(name: str) -> str:
+    """The two-pass slug generation that generate_slug replaced"""
+    slug = re.sub(r'[^a-zA-Z0-9-]', '-', name.lower()).strip('-')
+    return re.sub(r'-+', '-', slug)
+
+
+@pytest.mark.parametrize('name, slug', [
+    ('GitHub MCP Server', 'github-mcp-server'),
+    ('  my_server.v2  ', 'my-server-v2'),
+    ('--Weird -- Name!!', 'weird-name'),
+    ('Ünïcode Sërver', 'n-code-s-rver'),
+    ('@scope/mcp-server', 'scope-mcp-server'),
+    ('!!!', ''),
+])
+def test_generate_slug(name, slug):
+    assert discovered_servers.generate_slug(name) == slug
+    assert discovered_servers.generate_slug(name) == original_slug(name)